@@ -1,11 +1,46 @@
 from crewai import Agent
-from tools import scrape_tool, search_tool
+from tools import scrape_tool, search_tool, run_scoped_tool
 from langchain_google_genai import ChatGoogleGenerativeAI
+from context_cache import ContextCache, GeminiContextBackend
+from typing import Any
+import inspect
 import os
 import time
 import random
 from functools import wraps
 
+# Gemini models in order of preference
+GEMINI_MODELS = [
+    "gemini-2.0-flash",
+    "gemini-1.5-flash",
+    "gemini-1.5-pro",
+    "gemini-pro"
+]
+
+# Newer langchain-google-genai releases can reference provider-side cached content
+SUPPORTS_CACHED_CONTENT = "cached_content" in inspect.signature(ChatGoogleGenerativeAI._generate).parameters
+
+class ContextCachedGemini(ChatGoogleGenerativeAI):
+    """Gemini chat model that routes prompts through a per-run ContextCache"""
+    context_cache: Any = None
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.context_cache is not None:
+            texts = [m.content if isinstance(m.content, str) else "" for m in messages]
+            rewritten, provider_name = self.context_cache.rewrite(texts, self.model)
+            messages = [
+                m.copy(update={"content": text}) if isinstance(m.content, str) else m
+                for m, text in zip(messages, rewritten)
+            ]
+            if provider_name:
+                kwargs["cached_content"] = provider_name
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+def create_context_cache():
+    """Per-run context cache, backed by Gemini caching when the client supports it"""
+    backend = GeminiContextBackend(GEMINI_MODELS[0]) if SUPPORTS_CACHED_CONTENT else None
+    return ContextCache(backend=backend)
+
 def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60):
     """Decorator to retry function calls with exponential backoff"""
     def decorator(func):
@@ -33,33 +68,36 @@ def retry_with_backoff(max_retries=3, base_delay=1, max_delay=60):
 
 # Initialize the Gemini LLM with enhanced error handling
 @retry_with_backoff(max_retries=3, base_delay=2, max_delay=30)
-def get_gemini_llm():
+def get_gemini_llm(request_timeout=60, context_cache=None):
     """Initialize and return Google Gemini LLM with fallback options"""
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise ValueError("Please set GOOGLE_API_KEY or GEMINI_API_KEY environment variable")
     
     # Try different models in order of preference
-    models_to_try = [
-        "gemini-2.0-flash",
-        "gemini-1.5-flash",
-        "gemini-1.5-pro",
-        "gemini-pro"
-    ]
+    models_to_try = GEMINI_MODELS
+    
+    # Route prompts through the shared context cache when one is given
+    llm_class = ChatGoogleGenerativeAI
+    extra_config = {}
+    if context_cache is not None:
+        llm_class = ContextCachedGemini
+        extra_config["context_cache"] = context_cache
     
     for model in models_to_try:
         try:
-            llm = ChatGoogleGenerativeAI(
+            llm = llm_class(
                 model=model,
                 google_api_key=api_key,
                 temperature=0.7,
                 convert_system_message_to_human=True,
                 # Add request timeout and retry settings
-                request_timeout=60,
+                request_timeout=request_timeout,
                 max_retries=2,
                 # Add rate limiting parameters
                 max_tokens_per_minute=50000,
-                max_requests_per_minute=50
+                max_requests_per_minute=50,
+                **extra_config
             )
             
             # Test the model with a simple call
@@ -95,13 +133,42 @@ def get_gemini_llm_with_config(temperature=0.7, max_tokens=None):
     
     return ChatGoogleGenerativeAI(**config)
 
+# Per-agent defaults when no run deadline is given
+DEFAULT_MAX_EXECUTION_TIME = 300  # 5 minute timeout
+DEFAULT_REQUEST_TIMEOUT = 60
+
+def _run_scoped_tools(tools, tool_cache=None, deadline=None):
+    """Wrap agent tools with the per-run call cache and deadline"""
+    return [run_scoped_tool(t, tool_cache, deadline) for t in tools]
+
+def _agent_limits(time_budget=None):
+    """Agent execution limit and LLM request timeout for a time budget"""
+    if time_budget is None:
+        return DEFAULT_MAX_EXECUTION_TIME, DEFAULT_REQUEST_TIMEOUT
+    max_execution_time = max(int(time_budget), 1)
+    return max_execution_time, min(DEFAULT_REQUEST_TIMEOUT, max_execution_time)
+
+def apply_time_budget(agent, time_budget):
+    """Update an existing agent's execution limit and LLM request timeout.
+
+    CrewAI builds the agent executor when a task starts, so a new limit set
+    before then applies to that task.
+    """
+    max_execution_time, request_timeout = _agent_limits(time_budget)
+    agent.max_execution_time = max_execution_time
+    llm = getattr(agent, "llm", None)
+    for field in ("request_timeout", "timeout"):
+        if llm is not None and hasattr(llm, field):
+            setattr(llm, field, request_timeout)
+
 # Agent 1: Researcher
-def create_researcher():
+def create_researcher(tool_cache=None, deadline=None, context_cache=None):
+    max_execution_time, request_timeout = _agent_limits()
     return Agent(
         role="Tech Job Researcher",
         goal="Make sure to do amazing analysis on "
              "job posting to help job applicants",
-        tools=[scrape_tool, search_tool],
+        tools=_run_scoped_tools([scrape_tool, search_tool], tool_cache, deadline),
         verbose=True,
         backstory=(
             "As a Job Researcher, your prowess in "
@@ -112,18 +179,19 @@ def create_researcher():
             "by employers, forming the foundation for "
             "effective application tailoring."
         ),
-        llm=get_gemini_llm(),
+        llm=get_gemini_llm(request_timeout=request_timeout, context_cache=context_cache),
         max_iter=3,  # Limit iterations to prevent long runs
-        max_execution_time=300,  # 5 minute timeout
+        max_execution_time=max_execution_time,
     )
 
 # Agent 2: Profiler
-def create_profiler(read_resume, semantic_search_resume):
+def create_profiler(read_resume, semantic_search_resume, tool_cache=None, deadline=None, context_cache=None):
+    max_execution_time, request_timeout = _agent_limits()
     return Agent(
         role="Personal Profiler for Engineers",
         goal="Do incredible research on job applicants "
              "to help them stand out in the job market",
-        tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
+        tools=_run_scoped_tools([scrape_tool, search_tool, read_resume, semantic_search_resume], tool_cache, deadline),
         verbose=True,
         backstory=(
             "Equipped with analytical prowess, you dissect "
@@ -132,18 +200,19 @@ def create_profiler(read_resume, semantic_search_resume):
             "personal and professional profiles, laying the "
             "groundwork for personalized resume enhancements."
         ),
-        llm=get_gemini_llm(),
+        llm=get_gemini_llm(request_timeout=request_timeout, context_cache=context_cache),
         max_iter=3,
-        max_execution_time=300,
+        max_execution_time=max_execution_time,
     )
 
 # Agent 3: Resume Strategist
-def create_resume_strategist(read_resume, semantic_search_resume):
+def create_resume_strategist(read_resume, semantic_search_resume, tool_cache=None, deadline=None, context_cache=None):
+    max_execution_time, request_timeout = _agent_limits()
     return Agent(
         role="Resume Strategist for Engineers",
         goal="Find all the best ways to make a "
              "resume stand out in the job market.",
-        tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
+        tools=_run_scoped_tools([scrape_tool, search_tool, read_resume, semantic_search_resume], tool_cache, deadline),
         verbose=True,
         backstory=(
             "With a strategic mind and an eye for detail, you "
@@ -151,18 +220,19 @@ def create_resume_strategist(read_resume, semantic_search_resume):
             "relevant skills and experiences, ensuring they "
             "resonate perfectly with the job's requirements."
         ),
-        llm=get_gemini_llm(),
+        llm=get_gemini_llm(request_timeout=request_timeout, context_cache=context_cache),
         max_iter=3,
-        max_execution_time=300,
+        max_execution_time=max_execution_time,
     )
 
 # Agent 4: Interview Preparer
-def create_interview_preparer(read_resume, semantic_search_resume):
+def create_interview_preparer(read_resume, semantic_search_resume, tool_cache=None, deadline=None, context_cache=None):
+    max_execution_time, request_timeout = _agent_limits()
     return Agent(
         role="Engineering Interview Preparer",
         goal="Create interview questions and talking points "
              "based on the resume and job requirements",
-        tools=[scrape_tool, search_tool, read_resume, semantic_search_resume],
+        tools=_run_scoped_tools([scrape_tool, search_tool, read_resume, semantic_search_resume], tool_cache, deadline),
         verbose=True,
         backstory=(
             "Your role is crucial in anticipating the dynamics of "
@@ -171,9 +241,9 @@ def create_interview_preparer(read_resume, semantic_search_resume):
             "ensuring they can confidently address all aspects of the "
             "job they are applying for."
         ),
-        llm=get_gemini_llm(),
+        llm=get_gemini_llm(request_timeout=request_timeout, context_cache=context_cache),
         max_iter=3,
-        max_execution_time=300,
+        max_execution_time=max_execution_time,
     )
 
 # Alternative function to create agents with different models for load balancing
@@ -0,0 +1,192 @@
+import datetime
+import threading
+
+from resume import estimate_tokens
+
+# Blocks smaller than this aren't worth caching or deduplicating
+MIN_BLOCK_TOKENS = 128
+
+# Provider-cached input tokens are billed at roughly this fraction of the normal rate
+CACHED_INPUT_PRICE_RATIO = 0.25
+
+
+class GeminiContextBackend:
+    """Creates Gemini cached-content entries for large, stable inputs"""
+
+    def __init__(self, model, ttl_minutes=30, min_tokens=4096):
+        self.model = model
+        self.ttl_minutes = ttl_minutes
+        # Gemini rejects cached content below a model-specific minimum size
+        self.min_tokens = min_tokens
+
+    def create(self, display_name, text):
+        """Return a cached-content name, or None if the provider can't cache it"""
+        if estimate_tokens(text) < self.min_tokens:
+            return None
+        try:
+            from google.generativeai import caching
+            cached = caching.CachedContent.create(
+                model=f"models/{self.model}",
+                display_name=display_name,
+                contents=[text],
+                ttl=datetime.timedelta(minutes=self.ttl_minutes),
+            )
+            return cached.name
+        except Exception as e:
+            print(f"⚠️ Context caching unavailable, using local dedup: {e}")
+            return None
+
+    def delete(self, name):
+        """Delete a cached-content entry so it stops being billed before its TTL"""
+        try:
+            from google.generativeai import caching
+            caching.CachedContent.get(name).delete()
+        except Exception as e:
+            print(f"⚠️ Could not delete cached content {name}; it expires after {self.ttl_minutes} min: {e}")
+
+
+class ContextCache:
+    """Registers large stable inputs once per run and shrinks prompts that repeat them.
+
+    If a provider backend accepts the registered blocks, prompts reference the
+    provider's cached content and the blocks are stripped from the prompt text.
+    Otherwise only the first occurrence of each block in a prompt is kept and
+    later repeats are replaced with a short reference.
+    """
+
+    def __init__(self, backend=None, min_tokens=MIN_BLOCK_TOKENS):
+        self.backend = backend
+        self.min_tokens = min_tokens
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self._provider_name = None
+        self._provider_tokens = 0
+        self._provider_stale = False
+        # Bumped whenever the blocks change, so a slow provider create that
+        # finishes after a newer registration isn't mistaken for current
+        self._generation = 0
+        self._creating = False
+        self.calls = 0
+        self.input_tokens = 0
+        self.sent_tokens = 0
+        self.provider_cached_tokens = 0
+
+    def register(self, name, text):
+        """Register a large, stable input; small inputs are ignored"""
+        if not text or estimate_tokens(text) < self.min_tokens:
+            return False
+        self._store({name: text})
+        return True
+
+    def register_group(self, blocks):
+        """Register related inputs that are only worth caching together.
+
+        The size threshold applies to their combined text; each one is still
+        matched and replaced in prompts on its own.
+        """
+        blocks = {name: text for name, text in blocks.items() if text}
+        if not blocks or sum(estimate_tokens(text) for text in blocks.values()) < self.min_tokens:
+            return False
+        self._store(blocks)
+        return True
+
+    def _store(self, blocks):
+        with self._lock:
+            changed = {name: text for name, text in blocks.items() if self._blocks.get(name) != text}
+            if changed:
+                self._blocks.update(changed)
+                self._provider_stale = True
+                self._generation += 1
+
+    def provider_content_name(self, model=None):
+        """Provider cached-content name covering all registered blocks, if any"""
+        with self._lock:
+            if self.backend is None or not self._blocks:
+                return None
+            # Cached content can only be used with the model it was created for
+            if model is not None and model.split("/")[-1] != self.backend.model:
+                return None
+            if not self._provider_stale:
+                return self._provider_name
+            if self._creating:
+                # Another call is creating the provider entry; dedupe locally meanwhile
+                return None
+            self._creating = True
+            generation = self._generation
+            combined = "\n\n".join(f"### {name}\n{text}" for name, text in self._blocks.items())
+
+        # Creating cached content is a network call, so don't hold the lock for it
+        provider_name = None
+        try:
+            provider_name = self.backend.create("job-application-context", combined)
+        finally:
+            with self._lock:
+                self._creating = False
+                current = generation == self._generation
+                replaced = None
+                if current:
+                    replaced = self._provider_name
+                    self._provider_name = provider_name
+                    self._provider_tokens = estimate_tokens(combined) if provider_name else 0
+                    self._provider_stale = False
+
+        # Outdated entries are billed storage until their TTL, so delete them now
+        if not current:
+            # Blocks changed while this entry was being created
+            if provider_name:
+                self.backend.delete(provider_name)
+            return None
+        if replaced and replaced != provider_name:
+            self.backend.delete(replaced)
+        return provider_name
+
+    def rewrite(self, texts, model=None):
+        """Rewrite a prompt (list of message texts) to avoid resending registered blocks.
+
+        Returns (rewritten_texts, provider_content_name or None).
+        """
+        provider_name = self.provider_content_name(model)
+        use_provider = provider_name is not None
+        with self._lock:
+            blocks = list(self._blocks.items())
+
+        seen = set()
+        rewritten = []
+        for text in texts:
+            for name, block in blocks:
+                if block not in text:
+                    continue
+                if use_provider:
+                    text = text.replace(block, f"[{name}: see cached context]")
+                    continue
+                if name not in seen:
+                    # Keep the first occurrence, replace later repeats with a reference
+                    seen.add(name)
+                    head, _, tail = text.partition(block)
+                    text = head + block + tail.replace(block, f"[{name}: see above]")
+                else:
+                    text = text.replace(block, f"[{name}: see above]")
+            rewritten.append(text)
+
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += sum(estimate_tokens(text) for text in texts)
+            self.sent_tokens += sum(estimate_tokens(text) for text in rewritten)
+            if use_provider:
+                # The provider bills the whole cached prefix once per call
+                self.provider_cached_tokens += self._provider_tokens
+        return rewritten, provider_name
+
+    def summary(self):
+        """Estimated billed-input-token savings for this run"""
+        with self._lock:
+            removed = self.input_tokens - self.sent_tokens
+            billed_saved = removed - self.provider_cached_tokens * CACHED_INPUT_PRICE_RATIO
+            return {
+                "calls": self.calls,
+                "registered_blocks": len(self._blocks),
+                "input_tokens": self.input_tokens,
+                "sent_tokens": self.sent_tokens,
+                "provider_cached_tokens": self.provider_cached_tokens,
+                "billed_tokens_saved": int(billed_saved),
+            }
\ No newline at end of file
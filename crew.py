@@ -1,34 +1,124 @@
 from crewai import Crew
 from agents import create_researcher, create_profiler, create_resume_strategist, create_interview_preparer
-from tasks import create_tasks
-from tools import get_resume_tools_advanced
+from tasks import create_tasks, TASK_NAMES, TASK_INPUTS
+from tools import get_resume_tools_advanced, load_structured_resume
+from incremental import file_fingerprint, output_text
+from schemas import compact_task_output
 
-def create_job_application_crew(job_posting_url, github_url, personal_writeup, resume_path):
-    """Create the job application crew with dynamic tasks and agents"""
+def _chain_callbacks(callbacks):
+    """Combine several Task callbacks into one"""
+    def run_all(output):
+        for callback in callbacks:
+            callback(output)
+    return run_all
+
+def create_job_application_crew(job_posting_url, github_url, personal_writeup, resume_path, token_meter=None, run_cache=None, tool_cache=None, deadline=None, task_timer=None, context_cache=None, payload_meter=None, task_budgeter=None):
+    """Create the job application crew with dynamic tasks and agents.
+    
+    When a TaskRunCache is given, only tasks affected by changed inputs are
+    included, and only their agents are built; returns None if nothing
+    changed since the cached run. A
+    ToolCallCache deduplicates identical tool calls across all agents. A
+    Deadline caps tool calls; a TaskBudgeter is given the tasks that will
+    run and re-splits the time left over them as each one finishes, and a
+    TaskTimer records each task's duration for future budgets. A
+    ContextCache keeps the resume, job analysis and backstories from being
+    re-sent in full on every LLM call. Structured research and profile
+    outputs are compacted to JSON for downstream tasks; a PayloadMeter
+    records their token counts before and after.
+    """
     
     # Get resume tools - now supports PDF, MD, and TXT files
     try:
-        read_resume, semantic_search_resume = get_resume_tools_advanced(resume_path)
+        read_resume, semantic_search_resume = get_resume_tools_advanced(resume_path, token_meter)
         print(f"✅ Successfully initialized resume tools for: {resume_path}")
     except Exception as e:
         print(f"❌ Error initializing resume tools: {e}")
         raise e
     
-    # Create agents with resume tools
-    researcher = create_researcher()
-    profiler = create_profiler(read_resume, semantic_search_resume)
-    resume_strategist = create_resume_strategist(read_resume, semantic_search_resume)
-    interview_preparer = create_interview_preparer(read_resume, semantic_search_resume)
+    # Create tasks first, without agents: planning only needs the task graph,
+    # and building an agent makes a live LLM health check
+    named_tasks = dict(zip(TASK_NAMES, create_tasks(
+        job_posting_url, github_url, personal_writeup, None, None, None, None
+    )))
     
-    # Create tasks with the provided parameters and agents
-    research_task, profile_task, resume_strategy_task, interview_preparation_task = create_tasks(
-        job_posting_url, github_url, personal_writeup, researcher, profiler, resume_strategist, interview_preparer
-    )
+    # Skip tasks whose inputs (and upstream tasks) are unchanged since the last run
+    run_names = list(TASK_NAMES)
+    if run_cache is not None:
+        inputs = {
+            "job_posting_url": job_posting_url,
+            "github_url": github_url,
+            "personal_writeup": personal_writeup,
+            "resume": file_fingerprint(resume_path),
+        }
+        run_names = run_cache.plan(named_tasks, TASK_INPUTS, inputs)
+        skipped = [name for name in TASK_NAMES if name not in run_names]
+        if skipped:
+            print(f"♻️ Reusing cached output for: {', '.join(skipped)}")
+        if not run_names:
+            return None
+    
+    # Create agents with resume tools, only for the tasks that will run;
+    # time budgets are applied by the TaskBudgeter when the run starts
+    agent_factories = {
+        "research_task": lambda: create_researcher(tool_cache, deadline, context_cache=context_cache),
+        "profile_task": lambda: create_profiler(
+            read_resume, semantic_search_resume, tool_cache, deadline, context_cache=context_cache
+        ),
+        "resume_strategy_task": lambda: create_resume_strategist(
+            read_resume, semantic_search_resume, tool_cache, deadline, context_cache=context_cache
+        ),
+        "interview_preparation_task": lambda: create_interview_preparer(
+            read_resume, semantic_search_resume, tool_cache, deadline, context_cache=context_cache
+        ),
+    }
+    for name in run_names:
+        # Task.execute falls back to the agent's tools when the task has none
+        named_tasks[name].agent = agent_factories[name]()
+    agents = [named_tasks[name].agent for name in run_names]
+    
+    # Register large, stable inputs once so repeated prompts can reference them
+    if context_cache is not None:
+        resume = load_structured_resume(resume_path)
+        if resume is not None:
+            context_cache.register("resume", resume.to_text())
+            for section in resume.sections:
+                context_cache.register(f"resume section {section.id}", resume.section_text(section.id))
+        # Each backstory is too small to cache alone, but they're sent on every call
+        context_cache.register_group({f"{agent.role} backstory": agent.backstory for agent in agents})
+        if "research_task" not in run_names:
+            context_cache.register("job analysis", run_cache.outputs.get("research_task"))
+    
+    # Task completion hooks: compact structured outputs, record latency for
+    # future budgets, re-budget the remaining tasks and share the job analysis
+    for name in run_names:
+        task = named_tasks[name]
+        hooks = []
+        if getattr(task, "output_pydantic", None) is not None:
+            hooks.append(lambda output, name=name: compact_task_output(name, output, payload_meter))
+        if task_timer is not None:
+            hooks.append(task_timer.callback_for(name))
+        if task_budgeter is not None:
+            hooks.append(task_budgeter.callback_for(name))
+        if context_cache is not None and name == "research_task":
+            hooks.append(lambda output: context_cache.register("job analysis", output_text(output)))
+        if hooks:
+            task.callback = _chain_callbacks(hooks)
+    
+    # Inline cached outputs of skipped upstream tasks into the tasks that run
+    if run_cache is not None:
+        tasks = run_cache.prepare(named_tasks, run_names)
+    else:
+        tasks = [named_tasks[name] for name in run_names]
+    
+    # Only the tasks that will actually run share the deadline
+    if task_budgeter is not None:
+        task_budgeter.plan([(name, task.agent) for name, task in zip(run_names, tasks)])
     
     # Create and return the crew
     job_application_crew = Crew(
-        agents=[researcher, profiler, resume_strategist, interview_preparer],
-        tasks=[research_task, profile_task, resume_strategy_task, interview_preparation_task],
+        agents=[task.agent for task in tasks],
+        tasks=tasks,
         verbose=True
     )
     
@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+
+# Overall SLA for one crew run (override with RUN_DEADLINE_SECONDS)
+DEFAULT_RUN_DEADLINE = 600
+
+# Starting per-task latency estimates (seconds) before any history is observed
+DEFAULT_TASK_SECONDS = {
+    "research_task": 120,
+    "profile_task": 120,
+    "resume_strategy_task": 180,
+    "interview_preparation_task": 150,
+}
+
+# Never give a task less than this, even when the deadline is tight
+MIN_TASK_SECONDS = 30
+
+# Share of the run deadline held back for retries and finalizing results
+RESERVE_FRACTION = 0.1
+
+
+class Deadline:
+    """An absolute point in time that a run must finish by"""
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self._clock = clock
+        self.expires_at = clock() + seconds
+
+    def remaining(self):
+        return max(self.expires_at - self._clock(), 0.0)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def cap(self, seconds):
+        """Limit a timeout or sleep so it never runs past the deadline"""
+        return min(seconds, self.remaining())
+
+
+class LatencyHistory:
+    """Exponentially weighted per-task latency observed across runs"""
+
+    def __init__(self, alpha=0.3):
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._estimates = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            previous = self._estimates.get(name)
+            if previous is None:
+                self._estimates[name] = seconds
+            else:
+                self._estimates[name] = self.alpha * seconds + (1 - self.alpha) * previous
+
+    def expected(self, name, default=None):
+        with self._lock:
+            return self._estimates.get(name, default)
+
+
+# Shared by all sessions: model latency is a property of the provider, not the user
+latency_history = LatencyHistory()
+
+
+def run_deadline_seconds():
+    return float(os.getenv("RUN_DEADLINE_SECONDS", DEFAULT_RUN_DEADLINE))
+
+
+def allocate_budgets(deadline, task_names, history=None):
+    """Split the time left on a deadline across tasks by expected latency"""
+    history = latency_history if history is None else history
+    available = deadline.remaining() * (1 - RESERVE_FRACTION)
+    expected = {
+        name: history.expected(name, DEFAULT_TASK_SECONDS.get(name, 120))
+        for name in task_names
+    }
+    total = sum(expected.values()) or 1
+    # The floor shrinks when the deadline can't cover it for every task,
+    # so the budgets together never exceed the time left
+    floor = min(MIN_TASK_SECONDS, available / max(len(expected), 1))
+    return {
+        name: max(floor, available * seconds / total, 1)
+        for name, seconds in expected.items()
+    }
+
+
+class TaskBudgeter:
+    """Keeps the time limits of tasks still to run in step with the deadline.
+
+    Budgets are split over the pending tasks when a run (or a retry of it)
+    starts and again whenever a task finishes, so a slow task shrinks the
+    budgets of the tasks after it instead of pushing the run past the
+    deadline. apply_limits(agent, seconds) pushes a budget onto an agent.
+    """
+
+    def __init__(self, deadline, apply_limits, history=None):
+        self.deadline = deadline
+        self.apply_limits = apply_limits
+        self.history = history
+        self.budgets = {}
+        self._entries = []
+        self._done = set()
+
+    def plan(self, entries):
+        """Set the (task_name, agent) pairs that will run, in order"""
+        self._entries = list(entries)
+        self._done = set()
+
+    def start(self):
+        """Re-split the remaining time over every planned task (new run or retry)"""
+        self._done = set()
+        return self.rebalance()
+
+    def rebalance(self):
+        pending = [(name, agent) for name, agent in self._entries if name not in self._done]
+        if not pending:
+            self.budgets = {}
+            return self.budgets
+        budgets = allocate_budgets(self.deadline, [name for name, _ in pending], self.history)
+        self.budgets = {name: self.deadline.cap(seconds) for name, seconds in budgets.items()}
+        for name, agent in pending:
+            self.apply_limits(agent, self.budgets[name])
+        return self.budgets
+
+    def callback_for(self, name):
+        """Return a Task callback that re-budgets the tasks after this one"""
+        def finished(_output):
+            self._done.add(name)
+            self.rebalance()
+        return finished
+
+
+class TaskTimer:
+    """Records how long each task took into the latency history.
+
+    Tasks run sequentially, so a task's duration is the time since the
+    previous task finished (or since the run started).
+    """
+
+    def __init__(self, history=None, clock=time.monotonic):
+        self.history = latency_history if history is None else history
+        self._clock = clock
+        self._last_mark = None
+        self.durations = {}
+
+    def start(self):
+        self._last_mark = self._clock()
+
+    def callback_for(self, name):
+        """Return a Task callback that records the task's duration"""
+        def record(_output):
+            now = self._clock()
+            if self._last_mark is not None:
+                duration = now - self._last_mark
+                self.durations[name] = duration
+                self.history.observe(name, duration)
+            self._last_mark = now
+        return record
\ No newline at end of file
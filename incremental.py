@@ -0,0 +1,124 @@
+import hashlib
+
+from schemas import structured_output, compact_json, diff_structured
+
+
+def fingerprint(value):
+    """Stable short hash of an input value"""
+    return hashlib.sha256(str(value).encode("utf-8")).hexdigest()[:16]
+
+
+def file_fingerprint(path):
+    """Hash a file's content so re-uploads of the same resume match"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _context(task):
+    # Newer CrewAI versions use a sentinel instead of None for "no context"
+    context = getattr(task, "context", None)
+    return context if isinstance(context, list) else []
+
+
+def task_output_text(task):
+    """Return a task's raw output text across CrewAI versions"""
+    return output_text(getattr(task, "output", None))
+
+
+def output_text(output):
+    """Return the raw text of a TaskOutput across CrewAI versions"""
+    if output is None:
+        return None
+    # Structured outputs are stored as their compact JSON
+    model = structured_output(output)
+    if model is not None:
+        return compact_json(model)
+    for attr in ("raw", "raw_output", "exported_output"):
+        value = getattr(output, attr, None)
+        if value:
+            return str(value)
+    return str(output)
+
+
+class TaskRunCache:
+    """Remembers per-task input fingerprints and outputs between runs.
+
+    Each task records which inputs it read (see tasks.TASK_INPUTS). On the
+    next run only tasks whose own inputs changed, plus everything downstream
+    of them in the context graph, are re-executed; the others are served
+    from their previous output. For structured outputs, changes holds what
+    the re-executed tasks concluded differently from the previous run.
+    """
+
+    def __init__(self):
+        self.fingerprints = {}
+        self.outputs = {}
+        self.models = {}
+        self.changes = {}
+        self.last_result = None
+        self._pending = {}
+
+    def plan(self, named_tasks, task_inputs, inputs):
+        """Return the names of tasks that must run for these input values"""
+        current = {
+            name: {key: fingerprint(inputs.get(key)) for key in task_inputs.get(name, ())}
+            for name in named_tasks
+        }
+        names_by_task = {id(task): name for name, task in named_tasks.items()}
+
+        # named_tasks is in execution order, so upstream tasks are settled first
+        dirty = set()
+        for name, task in named_tasks.items():
+            upstream = {names_by_task.get(id(dep)) for dep in _context(task)}
+            if (current[name] != self.fingerprints.get(name)
+                    or name not in self.outputs
+                    or upstream & dirty):
+                dirty.add(name)
+
+        self._pending = {name: (named_tasks[name], current[name]) for name in dirty}
+        return [name for name in named_tasks if name in dirty]
+
+    def prepare(self, named_tasks, run_names):
+        """Return the tasks to execute, with skipped upstream context inlined"""
+        run_tasks = [named_tasks[name] for name in run_names]
+        skipped = {id(named_tasks[name]): name for name in named_tasks if name not in run_names}
+
+        for task in run_tasks:
+            context = _context(task)
+            cached_context = [
+                self.outputs[skipped[id(dep)]] for dep in context if id(dep) in skipped
+            ]
+            if not cached_context:
+                continue
+            task.context = [dep for dep in context if id(dep) not in skipped]
+            task.description = (
+                task.description
+                + "\n\nResults from previous tasks (unchanged since the last run):\n"
+                + "\n\n".join(cached_context)
+            )
+        return run_tasks
+
+    def commit(self, result=None):
+        """Store outputs of the planned tasks after a successful run"""
+        self.changes = {}
+        for name, (task, task_fingerprints) in self._pending.items():
+            text = task_output_text(task)
+            if text is None:
+                continue
+            self.fingerprints[name] = task_fingerprints
+            self.outputs[name] = text
+            model = structured_output(task.output)
+            if model is None:
+                continue
+            previous = self.models.get(name)
+            if previous is not None and type(previous) is type(model):
+                changes = diff_structured(previous, model)
+                if changes:
+                    self.changes[name] = changes
+            self.models[name] = model
+        self._pending = {}
+        if result is not None:
+            self.last_result = result
\ No newline at end of file
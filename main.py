@@ -6,7 +6,15 @@ import nest_asyncio
 import time
 import random
 from crew import create_job_application_crew
-from tools import get_resume_tools_advanced
+from agents import create_context_cache, apply_time_budget
+from schemas import PayloadMeter, describe_changes
+from tools import get_resume_tools_advanced, read_resume_text, scrape_tool, open_mapped, warm_search_index, release_resume_file
+from prescreen import score_match
+from incremental import TaskRunCache, task_output_text
+from deadlines import Deadline, TaskBudgeter, TaskTimer, run_deadline_seconds
+from toolcache import ToolCallCache
+from uploads import spool_upload, content_hash, check_upload_size, track_rss
+from resume import ResumeTokenMeter
 import PyPDF2
 
 # Apply nest_asyncio to allow nested event loops
@@ -19,10 +27,21 @@ st.set_page_config(
     layout="wide"
 )
 
-def run_crew_with_retry(crew, max_retries=3):
+# Minimum time a retried crew run needs to be worth starting
+MIN_RETRY_SECONDS = 60
+
+def run_crew_with_retry(crew, max_retries=3, deadline=None, task_budgeter=None, task_timer=None):
     """Run crew with retry logic for handling overloaded models"""
     for attempt in range(max_retries):
         try:
+            # Time each attempt from its own start, so a failed attempt and the
+            # backoff sleep aren't recorded as the first task's latency
+            if task_timer is not None:
+                task_timer.start()
+            # Each attempt re-splits whatever time is left over the tasks
+            if task_budgeter is not None:
+                budgets = task_budgeter.start()
+                print("⏱️ Task time budgets: " + ", ".join(f"{name}={seconds:.0f}s" for name, seconds in budgets.items()))
             return crew.kickoff()
         except Exception as e:
             error_str = str(e).lower()
@@ -31,8 +50,12 @@ def run_crew_with_retry(crew, max_retries=3):
                 
                 if attempt < max_retries - 1:
                     wait_time = (2 ** attempt) + random.uniform(1, 3)
+                    # Only retry if the backoff still leaves time for another attempt
+                    if deadline is not None and deadline.remaining() < wait_time + MIN_RETRY_SECONDS:
+                        st.error("❌ Not enough time left in this run to retry.")
+                        raise TimeoutError("Run deadline reached before the crew could be retried") from e
                     st.warning(f"⏳ Model is overloaded. Retrying in {wait_time:.1f} seconds... (Attempt {attempt + 1}/{max_retries})")
-                    time.sleep(wait_time)
+                    time.sleep(deadline.cap(wait_time) if deadline is not None else wait_time)
                     continue
                 else:
                     st.error("❌ All retry attempts failed. Please try again in a few minutes.")
@@ -42,27 +65,37 @@ def run_crew_with_retry(crew, max_retries=3):
                 raise e
     return None
 
-def run_crew_sync(crew):
+def run_crew_sync(crew, deadline=None, task_budgeter=None, task_timer=None):
     """Run crew synchronously, handling event loop issues"""
     try:
         # Try to get existing event loop
         loop = asyncio.get_event_loop()
         if loop.is_running():
             # If loop is running, we need to use nest_asyncio
-            return run_crew_with_retry(crew)
+            return run_crew_with_retry(crew, deadline=deadline, task_budgeter=task_budgeter, task_timer=task_timer)
         else:
             # If loop exists but not running, run it
-            return loop.run_until_complete(asyncio.create_task(run_crew_with_retry(crew)))
+            return loop.run_until_complete(asyncio.create_task(run_crew_with_retry(crew, deadline=deadline, task_budgeter=task_budgeter, task_timer=task_timer)))
     except RuntimeError:
         # No event loop exists, create one
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
         try:
-            return run_crew_with_retry(crew)
+            return run_crew_with_retry(crew, deadline=deadline, task_budgeter=task_budgeter, task_timer=task_timer)
         finally:
             # Don't close the loop as it might be needed elsewhere
             pass
 
+def discard_spooled_upload():
+    """Delete this session's spooled resume and drop the search index built from it"""
+    spooled = st.session_state.pop("spooled_upload", None)
+    if spooled and os.path.exists(spooled["path"]):
+        release_resume_file(spooled["path"])
+        try:
+            os.unlink(spooled["path"])
+        except OSError:
+            pass
+
 # Title and description
 st.title("🤖 AI Job Application Assistant")
 st.markdown("Upload your resume and let our AI agents help you tailor it for your dream job!")
@@ -109,34 +142,59 @@ with col1:
     )
     
     resume_path = None
-    if uploaded_file is not None:
+    if uploaded_file is None:
+        # The upload was removed; its spooled copy is no longer needed
+        discard_spooled_upload()
+    else:
         # Get file extension
         file_extension = os.path.splitext(uploaded_file.name)[1].lower()
         
-        # Show file size
-        file_size = len(uploaded_file.getvalue())
+        # Show file size (known up front, no need to copy the upload buffer)
+        file_size = uploaded_file.size
         st.info(f"📊 File size: {file_size / 1024:.1f} KB")
         
-        # Save uploaded file temporarily
-        if file_extension == '.pdf':
-            # For PDF files, save as binary
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.pdf', delete=False) as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
-                resume_path = tmp_file.name
-        else:
-            # For text/markdown files, save as text
-            with tempfile.NamedTemporaryFile(mode='w', suffix=file_extension, delete=False, encoding='utf-8') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue().decode('utf-8'))
-                resume_path = tmp_file.name
+        # Save uploaded file temporarily, streaming it to disk in bounded chunks
+        try:
+            check_upload_size(file_size)
+            
+            # Reruns reuse the spooled copy of an unchanged upload
+            spooled = st.session_state.get("spooled_upload")
+            if (spooled and spooled["size"] == file_size and os.path.exists(spooled["path"])
+                    and spooled["sha256"] == content_hash(uploaded_file)):
+                resume_path = spooled["path"]
+            else:
+                # A different file replaces the previous upload
+                discard_spooled_upload()
+                with track_rss() as upload_rss:
+                    resume_path, upload_hash, _ = spool_upload(
+                        uploaded_file, file_extension, on_chunk=upload_rss.sample
+                    )
+                st.session_state["spooled_upload"] = {
+                    "size": file_size,
+                    "path": resume_path,
+                    "sha256": upload_hash,
+                }
+                # Start embedding for semantic search without blocking this request
+                if file_extension in ('.pdf', '.md'):
+                    warm_search_index(resume_path)
+                rss_delta = upload_rss.peak_delta_mb
+                if rss_delta is not None:
+                    print(f"📈 Upload {uploaded_file.name}: {file_size / 1024:.1f} KB, "
+                          f"peak RSS +{rss_delta:.2f} MB while spooling")
+                    st.caption(f"Peak RSS increase while saving this upload: {rss_delta:.2f} MB (process-wide)")
+        except ValueError as e:
+            st.error(f"❌ {str(e)}")
+            resume_path = None
         
-        st.success(f"✅ Resume uploaded successfully! ({file_extension.upper()} format)")
+        if resume_path:
+            st.success(f"✅ Resume uploaded successfully! ({file_extension.upper()} format)")
         
         # Show file preview for PDF files
-        if file_extension == '.pdf':
+        if resume_path and file_extension == '.pdf':
             try:
                 # Extract and show first few lines of PDF
-                with open(resume_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
+                with open_mapped(resume_path) as mapped:
+                    pdf_reader = PyPDF2.PdfReader(mapped)
                     if len(pdf_reader.pages) > 0:
                         first_page_text = pdf_reader.pages[0].extract_text()
                         preview_text = first_page_text[:300] + "..." if len(first_page_text) > 300 else first_page_text
@@ -146,37 +204,29 @@ with col1:
                 st.warning(f"Could not preview PDF: {str(e)}")
         
         # Test resume tools
-        try:
-            read_resume, semantic_search_resume = get_resume_tools_advanced(resume_path)
-            st.success("✅ Resume tools initialized!")
-            
-            # Test if we can read content
+        if resume_path:
             try:
-                if file_extension == '.pdf':
-                    # For PDF files, test the search tool with a query
-                    if hasattr(semantic_search_resume, 'run'):
-                        test_content = semantic_search_resume.run("skills")
-                    else:
-                        # Fallback: read the file directly if it's been converted to text
-                        test_content = read_resume.run()
-                else:
-                    # For text/markdown files, just read the content
+                read_resume, semantic_search_resume = get_resume_tools_advanced(resume_path)
+                st.success("✅ Resume tools initialized!")
+            
+                # Test if we can read content (without waiting on the search index)
+                try:
                     test_content = read_resume.run()
                 
-                if test_content and len(str(test_content).strip()) > 0:
-                    st.success("✅ Resume content successfully extracted!")
-                    # Show a small preview of extracted content
-                    preview = str(test_content)[:200] + "..." if len(str(test_content)) > 200 else str(test_content)
-                    st.text_area("Content Preview:", preview, height=100, disabled=True)
-                else:
-                    st.warning("⚠️ Resume uploaded but content extraction may be limited")
-            except Exception as e:
-                st.warning(f"⚠️ Resume uploaded but there might be issues with content extraction: {str(e)}")
-                st.info("This might not affect the main processing - the tools may still work correctly during actual processing.")
+                    if test_content and len(str(test_content).strip()) > 0:
+                        st.success("✅ Resume content successfully extracted!")
+                        # Show a small preview of extracted content
+                        preview = str(test_content)[:200] + "..." if len(str(test_content)) > 200 else str(test_content)
+                        st.text_area("Content Preview:", preview, height=100, disabled=True)
+                    else:
+                        st.warning("⚠️ Resume uploaded but content extraction may be limited")
+                except Exception as e:
+                    st.warning(f"⚠️ Resume uploaded but there might be issues with content extraction: {str(e)}")
+                    st.info("This might not affect the main processing - the tools may still work correctly during actual processing.")
             
-        except Exception as e:
-            st.error(f"❌ Error initializing resume tools: {str(e)}")
-            st.error("Please try uploading a different file format or check if the file is corrupted.")
+            except Exception as e:
+                st.error(f"❌ Error initializing resume tools: {str(e)}")
+                st.error("Please try uploading a different file format or check if the file is corrupted.")
 
 with col2:
     st.header("🎯 Job Details")
@@ -199,6 +249,36 @@ with col2:
         help="A personal summary that highlights your strengths and career objectives"
     )
 
+# Quick local pre-screen before committing to a full crew run
+if resume_path and job_posting_url:
+    st.header("📊 Quick Match Check")
+    try:
+        # Cache the fetched posting per URL so reruns don't re-scrape it
+        posting_cache = st.session_state.setdefault("posting_text_cache", {})
+        if job_posting_url not in posting_cache:
+            with st.spinner("Fetching job posting..."):
+                posting_cache[job_posting_url] = str(scrape_tool.run(website_url=job_posting_url))
+        posting_text = posting_cache[job_posting_url]
+        resume_text = read_resume_text(resume_path)
+        
+        if posting_text and resume_text:
+            match = score_match(resume_text, posting_text)
+            match_col1, match_col2 = st.columns([1, 2])
+            with match_col1:
+                st.metric("Match Score", f"{match.score:.0f}/100")
+                st.caption(f"Skills: {match.skill_score:.0f}% · Keywords: {match.keyword_score:.0f}%")
+            with match_col2:
+                if match.matched_skills:
+                    st.success("✅ Matched skills: " + ", ".join(match.matched_skills))
+                if match.missing_skills:
+                    st.warning("⚠️ Skill gaps: " + ", ".join(match.missing_skills))
+            if match.score < 30:
+                st.info("💡 This posting looks like a weak match. Consider whether a full run is worth it.")
+        else:
+            st.info("Could not compute a match score for this resume and posting.")
+    except Exception as e:
+        st.warning(f"⚠️ Quick match check unavailable: {str(e)}")
+
 # Process button
 st.header("🚀 Generate Application Materials")
 
@@ -228,6 +308,7 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
             st.error(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
             st.info("Please set up your API keys in your environment variables and restart the app.")
         else:
+            crew = None
             try:
                 with st.spinner("🤖 AI agents are working on your application..."):
                     # Create progress indicators
@@ -238,15 +319,31 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
                     
                     # Add estimated time
                     start_time = time.time()
+                    deadline = Deadline(run_deadline_seconds())
+                    task_timer = TaskTimer()
+                    task_budgeter = TaskBudgeter(deadline, apply_time_budget)
                     status_text.text("🔍 Creating AI crew... (Estimated time: 2-5 minutes)")
                     progress_bar.progress(5)
                     
-                    # Create crew
+                    # Create crew (only tasks affected by changed inputs are included)
+                    token_meter = ResumeTokenMeter()
+                    run_cache = st.session_state.setdefault("task_run_cache", TaskRunCache())
+                    tool_cache = ToolCallCache()
+                    context_cache = create_context_cache()
+                    payload_meter = PayloadMeter()
                     crew = create_job_application_crew(
                         job_posting_url=job_posting_url,
                         github_url=github_url or "Not provided",
                         personal_writeup=personal_writeup or "Not provided",
-                        resume_path=resume_path
+                        resume_path=resume_path,
+                        token_meter=token_meter,
+                        run_cache=run_cache,
+                        tool_cache=tool_cache,
+                        deadline=deadline,
+                        task_timer=task_timer,
+                        context_cache=context_cache,
+                        payload_meter=payload_meter,
+                        task_budgeter=task_budgeter
                     )
                     
                     progress_bar.progress(15)
@@ -265,12 +362,60 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
                     status_text.text("⚡ Finalizing results...")
                     
                     # Run the crew with improved error handling
-                    result = run_crew_sync(crew)
+                    if crew is None:
+                        st.info("♻️ No inputs changed since the last run - showing previous results.")
+                        result = run_cache.last_result
+                    else:
+                        result = run_crew_sync(
+                            crew, deadline=deadline, task_budgeter=task_budgeter, task_timer=task_timer
+                        )
+                        run_cache.commit(result)
                     
                     progress_bar.progress(100)
                     elapsed_time = time.time() - start_time
                     status_text.text(f"✅ Complete! (Processed in {elapsed_time:.1f} seconds)")
                     
+                    # Report resume tokens served to agents this run
+                    usage = token_meter.summary()
+                    if usage["calls"]:
+                        st.info(
+                            f"📉 Resume reads: {usage['calls']} call(s), ~{usage['tokens_served']} tokens served "
+                            f"(~{usage['tokens_saved']} saved vs. full-resume reads)"
+                        )
+                    
+                    # Report input tokens saved by context caching / prompt dedup
+                    context_usage = context_cache.summary()
+                    if context_usage["billed_tokens_saved"] > 0:
+                        st.info(
+                            f"💾 Context caching: ~{context_usage['billed_tokens_saved']} billed input tokens saved "
+                            f"across {context_usage['calls']} LLM call(s) "
+                            f"({context_usage['input_tokens']} → {context_usage['sent_tokens']} prompt tokens)"
+                        )
+                    
+                    # Report structured output size vs. the agents' raw responses
+                    payload_usage = payload_meter.summary()
+                    if payload_usage["tasks"]:
+                        st.info(
+                            f"🧾 Structured research/profile outputs: ~{payload_usage['raw_tokens']} → "
+                            f"~{payload_usage['compact_tokens']} tokens passed to downstream tasks"
+                        )
+                    
+                    # Report tool calls saved by single-flight dedup
+                    if tool_cache.total_saved():
+                        saved = ", ".join(
+                            f"{name}: {stats['deduped']}/{stats['calls']}"
+                            for name, stats in tool_cache.summary().items() if stats["deduped"]
+                        )
+                        st.info(f"🔁 Duplicate tool calls reused: {saved}")
+                    
+                    # Show how the job analysis / candidate profile moved since the previous run
+                    if crew is not None and run_cache.changes:
+                        with st.expander("🔀 What changed since the last run"):
+                            for name, changes in run_cache.changes.items():
+                                st.markdown(f"**{name.replace('_', ' ').title()}**")
+                                for line in describe_changes(changes):
+                                    st.markdown(f"- {line}")
+                    
                     st.success("🎉 Your application materials have been generated!")
                     
                     # Display results
@@ -313,10 +458,9 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
                         st.header("📋 Generated Content")
                         st.text_area("Raw Output:", str(result), height=400)
                     
-                    # Clean up temporary files
+                    # Clean up temporary files. Spooled resumes aren't matched here: they
+                    # stay while their session uses them, so reruns reuse the parse and index
                     try:
-                        if resume_path and os.path.exists(resume_path):
-                            os.unlink(resume_path)
                         # Clean up any temporary text files created from PDF conversion
                         temp_dir = tempfile.gettempdir()
                         for file in os.listdir(temp_dir):
@@ -332,6 +476,18 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
                 st.error(f"❌ An error occurred: {str(e)}")
                 st.error(f"Error type: {type(e).__name__}")
                 
+                # Degrade gracefully: show whatever tasks finished before the failure
+                if crew is not None:
+                    partial_outputs = [
+                        (task.description.split(".")[0], task_output_text(task)) for task in crew.tasks
+                    ]
+                    partial_outputs = [(title, text) for title, text in partial_outputs if text]
+                    if partial_outputs:
+                        st.warning(f"⚠️ Showing partial results from {len(partial_outputs)} completed task(s).")
+                        for title, text in partial_outputs:
+                            with st.expander(f"📋 {title[:80]}"):
+                                st.markdown(text)
+                
                 # Specific handling for common errors
                 error_str = str(e).lower()
                 if "503" in error_str or "overloaded" in error_str:
@@ -359,13 +515,6 @@ if st.button("🎯 Tailor My Application", type="primary", use_container_width=T
                 - Try with a smaller resume file
                 - Wait and try again during off-peak hours
                 """)
-                
-                # Clean up temporary file on error
-                if resume_path:
-                    try:
-                        os.unlink(resume_path)
-                    except:
-                        pass
 
 # Footer
 st.markdown("---")
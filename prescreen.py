@@ -0,0 +1,231 @@
+import re
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+# Bundled skills taxonomy: canonical skill -> lowercase aliases as they appear in text.
+# Words that are common in ordinary prose ("rest", "spring", "node", "security")
+# only match in a multi-word form; a few tech names that rarely mean anything
+# else in a job posting ("rust", "spark", "flask") are kept as single words.
+SKILLS_TAXONOMY = {
+    # Languages
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript", "ts"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust"],
+    "C": ["c language", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", ".net", "dotnet", "asp.net"],
+    "Ruby": ["ruby"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swiftui", "swift language", "swift programming"],
+    "Scala": ["scala"],
+    "R": ["r language", "rstudio"],
+    "SQL": ["sql", "t-sql", "pl/sql"],
+    "Bash": ["bash", "shell scripting", "zsh"],
+    # Web & frameworks
+    "React": ["react", "react.js", "reactjs"],
+    "Angular": ["angular", "angularjs"],
+    "Vue": ["vue", "vue.js", "vuejs"],
+    "Node.js": ["node.js", "nodejs"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "spring framework", "spring mvc"],
+    "Rails": ["rails", "ruby on rails"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["restful", "rest api", "rest apis"],
+    "gRPC": ["grpc"],
+    "HTML/CSS": ["html", "css", "html5", "css3"],
+    # Data & ML
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning"],
+    "NLP": ["nlp", "natural language processing"],
+    "Computer Vision": ["computer vision"],
+    "LLMs": ["llm", "llms", "large language models", "generative ai", "genai"],
+    "PyTorch": ["pytorch", "torch"],
+    "TensorFlow": ["tensorflow", "keras"],
+    "scikit-learn": ["scikit-learn", "sklearn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Spark": ["spark", "pyspark", "apache spark"],
+    "Airflow": ["airflow"],
+    "Kafka": ["kafka"],
+    "Data Engineering": ["data engineering", "etl", "data pipelines"],
+    # Databases
+    "PostgreSQL": ["postgresql", "postgres"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic"],
+    "Snowflake": ["snowflake"],
+    "BigQuery": ["bigquery"],
+    # Cloud & infrastructure
+    "AWS": ["aws", "amazon web services", "ec2", "s3", "aws lambda"],
+    "GCP": ["gcp", "google cloud"],
+    "Azure": ["azure"],
+    "Docker": ["docker", "docker compose"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "CI/CD": ["ci/cd", "continuous integration", "jenkins", "github actions", "gitlab ci"],
+    "Linux": ["linux", "unix"],
+    "Microservices": ["microservices", "microservice"],
+    "Distributed Systems": ["distributed systems"],
+    "Observability": ["observability", "prometheus", "grafana", "datadog"],
+    "Security": ["application security", "security engineering", "cybersecurity", "owasp", "appsec"],
+    # Practices
+    "Git": ["git"],
+    "Testing": ["unit testing", "integration testing", "automated testing", "test automation", "pytest", "jest", "tdd"],
+    "Agile": ["agile", "scrum", "kanban"],
+    "System Design": ["system design", "software architecture", "systems architecture"],
+    "Leadership": ["leadership", "mentoring", "mentorship"],
+    "Communication": ["communication skills", "written communication", "verbal communication"],
+}
+
+STOPWORDS = {
+    "the", "and", "for", "with", "you", "our", "are", "will", "your", "this",
+    "that", "from", "have", "has", "who", "what", "all", "can", "job", "role",
+    "work", "team", "teams", "experience", "years", "year", "ability", "strong",
+    "skills", "including", "about", "into", "their", "they", "them", "using",
+    "use", "such", "other", "more", "must", "should", "would", "plus", "etc",
+    "across", "within", "help", "join", "well", "new", "not", "but", "any",
+    "also", "able", "working", "knowledge", "understanding", "preferred",
+}
+
+SKILL_NAMES = list(SKILLS_TAXONOMY)
+_ALIAS_INDEX = {
+    alias: index
+    for index, name in enumerate(SKILL_NAMES)
+    for alias in SKILLS_TAXONOMY[name]
+}
+_MAX_ALIAS_WORDS = max(len(alias.split()) for alias in _ALIAS_INDEX)
+# Aliases that are only a skill next to a related one, e.g. "spring" counts
+# as Spring only when Java is also mentioned: alias -> (skill, required skill)
+CONTEXTUAL_ALIASES = {
+    "spring": ("Spring", "Java"),
+}
+
+# A leading "." is kept so ".net" matches; "/" is handled in _tokenize
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#./\-]*")
+
+# Weight of skill overlap vs. generic keyword overlap in the final score
+SKILL_WEIGHT = 0.8
+KEYWORD_WEIGHT = 0.2
+TOP_KEYWORDS = 40
+
+
+@dataclass
+class MatchResult:
+    score: float
+    skill_score: float
+    keyword_score: float
+    matched_skills: List[str]
+    missing_skills: List[str]
+
+
+def _tokenize(text):
+    tokens = []
+    for token in TOKEN_PATTERN.findall((text or "").lower()):
+        token = token.rstrip(".-/")
+        if "/" in token and token not in _ALIAS_INDEX:
+            # "python/django" is two skills; "ci/cd" and "pl/sql" stay whole
+            tokens.extend(part.strip(".-") for part in token.split("/") if part.strip(".-"))
+        elif token:
+            tokens.append(token)
+    return tokens
+
+
+def skill_vector(text):
+    """Count taxonomy skill mentions in text as a vector over SKILL_NAMES"""
+    vector = np.zeros(len(SKILL_NAMES), dtype=np.float32)
+    tokens = _tokenize(text)
+    # Token positions already counted as part of a multi-word alias
+    covered = set()
+    for size in range(1, _MAX_ALIAS_WORDS + 1):
+        for start in range(len(tokens) - size + 1):
+            index = _ALIAS_INDEX.get(" ".join(tokens[start:start + size]))
+            if index is not None:
+                vector[index] += 1
+                if size > 1:
+                    covered.update(range(start, start + size))
+    for position, token in enumerate(tokens):
+        if token in CONTEXTUAL_ALIASES and position not in covered:
+            skill, required = CONTEXTUAL_ALIASES[token]
+            if vector[SKILL_NAMES.index(required)] > 0:
+                vector[SKILL_NAMES.index(skill)] += 1
+    return vector
+
+
+def keyword_counts(text):
+    """Count non-stopword keywords in text"""
+    counts = {}
+    for token in _tokenize(text):
+        if len(token) < 3 or token in STOPWORDS or token.isdigit():
+            continue
+        counts[token] = counts.get(token, 0) + 1
+    return counts
+
+
+def _keyword_score(resume_keywords, posting_text):
+    counts = keyword_counts(posting_text)
+    if not counts:
+        return 0.0
+    top = sorted(counts, key=counts.get, reverse=True)[:TOP_KEYWORDS]
+    weights = np.array([counts[word] for word in top], dtype=np.float32)
+    present = np.array([word in resume_keywords for word in top], dtype=np.float32)
+    return float(weights @ present / weights.sum())
+
+
+def score_postings(resume_text, posting_texts):
+    """Score one resume against many postings in a single vectorised pass"""
+    resume_present = (skill_vector(resume_text) > 0).astype(np.float32)
+    resume_keywords = set(keyword_counts(resume_text))
+
+    if not posting_texts:
+        return []
+
+    # Rows are postings, columns are taxonomy skills; log-damp repeated mentions
+    weights = np.log1p(np.stack([skill_vector(text) for text in posting_texts]))
+    totals = weights.sum(axis=1)
+    covered = weights @ resume_present
+    skill_scores = np.divide(covered, totals, out=np.zeros_like(covered), where=totals > 0)
+
+    results = []
+    for row, text in enumerate(posting_texts):
+        keyword_score = _keyword_score(resume_keywords, text)
+        if totals[row] > 0:
+            score = SKILL_WEIGHT * skill_scores[row] + KEYWORD_WEIGHT * keyword_score
+        else:
+            # No taxonomy skills in the posting: fall back to keywords only
+            score = keyword_score
+        order = np.argsort(-weights[row], kind="stable")
+        matched = [SKILL_NAMES[i] for i in order if weights[row, i] > 0 and resume_present[i]]
+        missing = [SKILL_NAMES[i] for i in order if weights[row, i] > 0 and not resume_present[i]]
+        results.append(MatchResult(
+            score=round(float(score) * 100, 1),
+            skill_score=round(float(skill_scores[row]) * 100, 1),
+            keyword_score=round(keyword_score * 100, 1),
+            matched_skills=matched,
+            missing_skills=missing,
+        ))
+    return results
+
+
+def score_match(resume_text, posting_text):
+    """Score how well a resume matches a single job posting (0-100)"""
+    return score_postings(resume_text, [posting_text])[0]
+
+
+def rank_postings(resume_text, postings, top_n=None):
+    """Rank postings ({url: text}) by match score, best first.
+
+    Batch callers can run the crew only on the returned top N URLs.
+    """
+    urls = list(postings)
+    results = score_postings(resume_text, [postings[url] for url in urls])
+    ranked = sorted(zip(urls, results), key=lambda item: item[1].score, reverse=True)
+    return ranked[:top_n] if top_n else ranked
\ No newline at end of file
@@ -0,0 +1,291 @@
+import re
+import sys
+from dataclasses import dataclass
+from typing import List
+
+# Headings commonly found in engineering resumes (matched case-insensitively)
+KNOWN_HEADINGS = {
+    "summary", "professional summary", "profile", "objective", "about",
+    "about me", "experience", "work experience", "professional experience",
+    "employment", "employment history", "projects", "personal projects",
+    "education", "skills", "technical skills", "core skills", "technologies",
+    "tools", "certifications", "certificates", "awards", "achievements",
+    "publications", "languages", "interests", "volunteering", "leadership",
+}
+
+# Sections whose non-bullet lines start a new role/entry
+ROLE_SECTION_KEYWORDS = ("experience", "employment", "project", "education", "leadership", "volunteer")
+
+# Sections whose lines are split into individual skills
+SKILL_SECTION_KEYWORDS = ("skill", "technolog", "tools", "languages")
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•▪◦●‣]|\d+[.)])\s+")
+MARKDOWN_HEADING_PATTERN = re.compile(r"^\s*#{1,6}\s+(.*)$")
+SKILL_SPLIT_PATTERN = re.compile(r"\s*(?:[,;|•·]|\s/\s)\s*")
+
+# Characters that mark a line as a list of items rather than a heading
+LIST_SEPARATORS = (",", ";", "|")
+
+# Bullets at least this long were probably wrapped onto the next line by PDF extraction
+WRAPPED_LINE_LENGTH = 60
+
+# Year ranges such as "2020-2024", "2019 – Present" that mark a role title line
+DATE_RANGE_PATTERN = re.compile(
+    r"\b(?:19|20)\d{2}\s*(?:-|–|—|to)\s*(?:(?:19|20)\d{2}|present|current|now)\b", re.IGNORECASE
+)
+
+
+@dataclass
+class Bullet:
+    __slots__ = ("text",)
+    text: str
+
+
+@dataclass
+class Role:
+    __slots__ = ("title", "bullets")
+    title: str
+    bullets: List[Bullet]
+
+
+@dataclass
+class Section:
+    __slots__ = ("id", "heading", "roles", "bullets")
+    id: str
+    heading: str
+    roles: List[Role]
+    bullets: List[Bullet]
+
+
+@dataclass
+class Skill:
+    __slots__ = ("name", "section_id")
+    name: str
+    section_id: str
+
+
+@dataclass
+class Resume:
+    __slots__ = ("sections", "skills", "char_count")
+    sections: List[Section]
+    skills: List[Skill]
+    char_count: int
+
+    def get_section(self, section_id):
+        """Return the section with the given ID, or None"""
+        wanted = _slugify(section_id)
+        for section in self.sections:
+            if section.id == wanted:
+                return section
+        return None
+
+    def outline(self):
+        """Compact table of contents listing section IDs and skills"""
+        lines = ["Resume sections (request one by ID):"]
+        for section in self.sections:
+            parts = []
+            if section.roles:
+                parts.append(f"{len(section.roles)} entries")
+            if section.bullets:
+                parts.append(f"{len(section.bullets)} lines")
+            lines.append(f"- {section.id}: {section.heading} ({', '.join(parts) or 'empty'})")
+        if self.skills:
+            lines.append("Skills: " + ", ".join(skill.name for skill in self.skills))
+        return "\n".join(lines)
+
+    def section_text(self, section_id):
+        """Render a single section back to compact text"""
+        section = self.get_section(section_id)
+        if section is None:
+            return None
+        return render_section(section)
+
+    def to_text(self):
+        """Render the whole resume back to compact text"""
+        return "\n\n".join(render_section(section) for section in self.sections)
+
+    def raw_tokens(self):
+        """Estimated tokens of the original resume text agents used to read in full"""
+        return (self.char_count + 3) // 4
+
+
+class ResumeTokenMeter:
+    """Tracks how many resume tokens were served to agents during a run"""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens_served = 0
+        self.full_resume_tokens = 0
+
+    def record(self, text, full_resume_tokens):
+        self.calls += 1
+        self.tokens_served += estimate_tokens(text)
+        self.full_resume_tokens = full_resume_tokens
+
+    def summary(self):
+        """Tokens served vs. what full-resume reads would have cost"""
+        full_read_tokens = self.calls * self.full_resume_tokens
+        return {
+            "calls": self.calls,
+            "tokens_served": self.tokens_served,
+            "full_read_tokens": full_read_tokens,
+            "tokens_saved": max(full_read_tokens - self.tokens_served, 0),
+        }
+
+
+def estimate_tokens(text):
+    """Rough token estimate (~4 characters per token for English text)"""
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
+
+
+def render_section(section):
+    lines = [f"## {section.heading}"]
+    for bullet in section.bullets:
+        lines.append(f"- {bullet.text}")
+    for role in section.roles:
+        lines.append(role.title)
+        for bullet in role.bullets:
+            lines.append(f"  - {bullet.text}")
+    return "\n".join(lines)
+
+
+def parse_resume(text):
+    """Parse raw resume text into a compact structured Resume"""
+    sections = []
+    seen_ids = set()
+    current = None
+    current_role = None
+    # Last bullet that a wrapped continuation line may belong to
+    open_bullet = None
+    open_bullet_line = ""
+
+    def start_section(heading):
+        section_id = _slugify(heading) or "section"
+        base_id, suffix = section_id, 2
+        while section_id in seen_ids:
+            section_id = f"{base_id}-{suffix}"
+            suffix += 1
+        seen_ids.add(section_id)
+        section = Section(section_id, heading, [], [])
+        sections.append(section)
+        return section
+
+    for raw_line in (text or "").splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        heading = _detect_heading(line, current)
+        if heading:
+            current = start_section(heading)
+            current_role = None
+            open_bullet = None
+            continue
+
+        if current is None:
+            current = start_section("Header")
+
+        is_bullet = bool(BULLET_PATTERN.match(line))
+        content = BULLET_PATTERN.sub("", line).strip()
+        if not content:
+            continue
+
+        if (not is_bullet and open_bullet is not None
+                and _is_continuation(open_bullet_line, content, _is_role_section(current))):
+            open_bullet.text += " " + content
+            open_bullet_line = line
+            continue
+
+        bullet = None
+        if _is_role_section(current) and not is_bullet:
+            current_role = Role(content, [])
+            current.roles.append(current_role)
+        elif current_role is not None and is_bullet:
+            bullet = Bullet(content)
+            current_role.bullets.append(bullet)
+        else:
+            bullet = Bullet(content)
+            current.bullets.append(bullet)
+
+        # Only real bullet items can continue onto the next line
+        open_bullet = bullet if is_bullet else None
+        open_bullet_line = line
+
+    return Resume(sections, _extract_skills(sections), len(text or ""))
+
+
+def _detect_heading(line, current=None):
+    markdown_match = MARKDOWN_HEADING_PATTERN.match(line)
+    if markdown_match:
+        return markdown_match.group(1).strip().strip("#").strip()
+
+    candidate = line.rstrip(":").strip()
+    if candidate.lower() in KNOWN_HEADINGS:
+        return candidate.title() if candidate.isupper() else candidate
+
+    # All-caps lines are headings unless they look like a list (e.g. "PYTHON, AWS, GCP")
+    if any(separator in candidate for separator in LIST_SEPARATORS):
+        return None
+    if current is not None and _is_skill_section(current):
+        return None
+    letters = [ch for ch in candidate if ch.isalpha()]
+    if (candidate.isupper() and len(letters) >= 4 and len(candidate) <= 40
+            and not BULLET_PATTERN.match(line)):
+        return candidate.title()
+    return None
+
+
+def _is_continuation(previous_line, content, in_role_section=False):
+    """Whether a non-bullet line continues a bullet wrapped by text extraction"""
+    if content[0].islower():
+        return True
+    # Resume bullets rarely end with a period, so the next role's title
+    # ("Software Engineer, Foo Corp (2017-2020)") must not be swallowed
+    if in_role_section and _looks_like_title(content):
+        return False
+    unterminated = not previous_line.rstrip().endswith((".", "!", "?", ";", ":"))
+    return unterminated and len(previous_line) >= WRAPPED_LINE_LENGTH
+
+
+def _looks_like_title(content):
+    return content[0].isupper() and ("," in content or "|" in content or bool(DATE_RANGE_PATTERN.search(content)))
+
+
+def _is_role_section(section):
+    heading = section.heading.lower()
+    return any(keyword in heading for keyword in ROLE_SECTION_KEYWORDS)
+
+
+def _is_skill_section(section):
+    heading = section.heading.lower()
+    return any(keyword in heading for keyword in SKILL_SECTION_KEYWORDS)
+
+
+def _extract_skills(sections):
+    skills = []
+    seen = set()
+    for section in sections:
+        if not _is_skill_section(section):
+            continue
+        lines = [bullet.text for bullet in section.bullets]
+        lines += [role.title for role in section.roles]
+        for line in lines:
+            # Drop "Languages:" style category labels
+            if ":" in line:
+                line = line.split(":", 1)[1]
+            for name in SKILL_SPLIT_PATTERN.split(line):
+                name = name.strip(" .")
+                if not name or len(name) > 40:
+                    continue
+                key = name.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                skills.append(Skill(sys.intern(name), section.id))
+    return skills
+
+
+def _slugify(value):
+    return re.sub(r"[^a-z0-9]+", "-", (value or "").lower()).strip("-")
\ No newline at end of file
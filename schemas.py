@@ -0,0 +1,129 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from resume import estimate_tokens
+
+
+class JobRequirement(BaseModel):
+    name: str = Field(description="Skill, qualification or experience, in a few words")
+    category: Literal["skill", "experience", "qualification", "responsibility", "other"] = "skill"
+    priority: Literal["must_have", "nice_to_have"] = "must_have"
+
+
+class JobRequirements(BaseModel):
+    """Structured output of research_task"""
+    job_title: str
+    company: Optional[str] = None
+    seniority: Optional[str] = None
+    requirements: List[JobRequirement]
+    keywords: List[str] = Field(default_factory=list, description="Terms worth mirroring in the resume")
+
+
+class ProfileSkill(BaseModel):
+    name: str
+    evidence: str = Field(description="Where the skill shows up: project, role or repository")
+    level: Literal["beginner", "intermediate", "advanced", "expert"] = "intermediate"
+
+
+class ProfileProject(BaseModel):
+    name: str
+    summary: str
+    technologies: List[str] = Field(default_factory=list)
+
+
+class CandidateProfile(BaseModel):
+    """Structured output of profile_task"""
+    summary: str
+    skills: List[ProfileSkill]
+    projects: List[ProfileProject] = Field(default_factory=list)
+    interests: List[str] = Field(default_factory=list)
+    communication_style: Optional[str] = None
+
+
+def structured_output(output):
+    """Return the validated pydantic model from a TaskOutput, if any"""
+    for attr in ("pydantic", "exported_output"):
+        value = getattr(output, attr, None)
+        if isinstance(value, BaseModel):
+            return value
+    return None
+
+
+def compact_json(model):
+    """Compact, stable JSON for a structured output (cacheable and diffable)"""
+    return model.model_dump_json(exclude_none=True)
+
+
+def diff_structured(old, new):
+    """Items added to / removed from each list field between two outputs of the same schema"""
+    old_data, new_data = old.model_dump(exclude_none=True), new.model_dump(exclude_none=True)
+    changes = {}
+    for field, new_value in new_data.items():
+        old_value = old_data.get(field)
+        if isinstance(new_value, list):
+            old_items = [repr(item) for item in old_value or []]
+            new_items = [repr(item) for item in new_value]
+            added = [item for item, key in zip(new_value, new_items) if key not in old_items]
+            removed = [item for item, key in zip(old_value or [], old_items) if key not in new_items]
+            if added or removed:
+                changes[field] = {"added": added, "removed": removed}
+        elif new_value != old_value:
+            changes[field] = {"old": old_value, "new": new_value}
+    return changes
+
+
+def _item_label(item):
+    return item.get("name", str(item)) if isinstance(item, dict) else str(item)
+
+
+def describe_changes(changes):
+    """One readable line per changed field of a diff_structured result"""
+    lines = []
+    for field, change in changes.items():
+        label = field.replace("_", " ")
+        if "added" in change:
+            parts = []
+            if change["added"]:
+                parts.append("added " + ", ".join(_item_label(item) for item in change["added"]))
+            if change["removed"]:
+                parts.append("removed " + ", ".join(_item_label(item) for item in change["removed"]))
+            lines.append(f"{label}: " + "; ".join(parts))
+        else:
+            lines.append(f"{label}: {change['old']!r} → {change['new']!r}")
+    return lines
+
+
+class PayloadMeter:
+    """Tokens of each structured task output before and after compaction"""
+
+    def __init__(self):
+        self.tasks = {}
+
+    def record(self, name, raw_text, compact_text):
+        self.tasks[name] = {
+            "raw_tokens": estimate_tokens(raw_text),
+            "compact_tokens": estimate_tokens(compact_text),
+        }
+
+    def summary(self):
+        raw = sum(task["raw_tokens"] for task in self.tasks.values())
+        compact = sum(task["compact_tokens"] for task in self.tasks.values())
+        return {"tasks": dict(self.tasks), "raw_tokens": raw, "compact_tokens": compact}
+
+
+def compact_task_output(name, output, payload_meter=None):
+    """Replace a structured TaskOutput's raw text with its compact JSON.
+
+    Downstream tasks read the raw text as context, so they receive the
+    validated payload instead of the model's full response.
+    """
+    model = structured_output(output)
+    if model is None:
+        return None
+    compact = compact_json(model)
+    raw_attr = "raw" if hasattr(output, "raw") else "raw_output"
+    if payload_meter is not None:
+        payload_meter.record(name, getattr(output, raw_attr, None), compact)
+    setattr(output, raw_attr, compact)
+    return compact
\ No newline at end of file
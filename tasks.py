@@ -1,4 +1,17 @@
 from crewai import Task
+from schemas import JobRequirements, CandidateProfile
+
+# Names of the tasks returned by create_tasks, in execution order
+TASK_NAMES = ("research_task", "profile_task", "resume_strategy_task", "interview_preparation_task")
+
+# Inputs each task reads directly (via its description or its agent's tools).
+# Upstream task outputs are tracked separately through each task's context.
+TASK_INPUTS = {
+    "research_task": ("job_posting_url",),
+    "profile_task": ("github_url", "personal_writeup", "resume"),
+    "resume_strategy_task": ("resume",),
+    "interview_preparation_task": ("resume",),
+}
 
 def create_tasks(job_posting_url, github_url, personal_writeup, researcher, profiler, resume_strategist, interview_preparer):
     # Task for Researcher Agent: Extract Job Requirements
@@ -11,8 +24,11 @@ def create_tasks(job_posting_url, github_url, personal_writeup, researcher, prof
         ),
         expected_output=(
             "A structured list of job requirements, including necessary "
-            "skills, qualifications, and experiences."
+            "skills, qualifications, and experiences. Return JSON with the "
+            "job title, company, seniority, a list of requirements (each with "
+            "name, category and must_have/nice_to_have priority) and keywords."
         ),
+        output_pydantic=JobRequirements,
         agent=researcher
         # Removed async_execution=True to avoid event loop issues in Streamlit
     )
@@ -26,10 +42,13 @@ def create_tasks(job_posting_url, github_url, personal_writeup, researcher, prof
             "synthesize information from these sources."
         ),
         expected_output=(
-            "A comprehensive profile document that includes skills, "
+            "A comprehensive profile that includes skills, "
             "project experiences, contributions, interests, and "
-            "communication style."
+            "communication style. Return JSON with a short summary, a skill "
+            "inventory (each skill with evidence and level), projects, "
+            "interests and communication style."
         ),
+        output_pydantic=CandidateProfile,
         agent=profiler
         # Removed async_execution=True to avoid event loop issues in Streamlit
     )
@@ -37,8 +56,8 @@ def create_tasks(job_posting_url, github_url, personal_writeup, researcher, prof
     # Task for Resume Strategist Agent: Align Resume with Job Requirements
     resume_strategy_task = Task(
         description=(
-            "Using the profile and job requirements obtained from "
-            "previous tasks, tailor the resume to highlight the most "
+            "Using the candidate profile and job requirements obtained from "
+            "previous tasks (provided as structured JSON), tailor the resume to highlight the most "
             "relevant areas. Employ tools to adjust and enhance the "
             "resume content. Make sure this is the best resume even but "
             "don't make up any information. Update every section, "
@@ -59,7 +78,8 @@ def create_tasks(job_posting_url, github_url, personal_writeup, researcher, prof
     interview_preparation_task = Task(
         description=(
             "Create a set of potential interview questions and talking "
-            "points based on the tailored resume and job requirements. "
+            "points based on the tailored resume and job requirements "
+            "(job requirements and candidate profile are structured JSON). "
             "Utilize tools to generate relevant questions and discussion "
             "points. Make sure to use these questions and talking points to "
             "help the candidate highlight the main points of the resume "
@@ -0,0 +1,110 @@
+import threading
+
+from context_cache import ContextCache
+
+RESUME = "Senior engineer building data pipelines in Python and Go. " * 40
+BACKSTORIES = {
+    "Researcher backstory": "You analyse job postings and pick out what matters to hiring managers. " * 4,
+    "Profiler backstory": "You build detailed profiles of candidates from their public work. " * 4,
+}
+
+
+class FakeEndpoint:
+    """Stands in for the provider's cached-content API"""
+
+    model = "gemini-2.0-flash"
+
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.entered = threading.Event()
+        self.created = []
+        self.deleted = []
+
+    def create(self, display_name, text):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        self.created.append(text)
+        return f"cachedContents/{len(self.created)}"
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+
+def test_small_backstories_are_registered_together():
+    cache = ContextCache()
+    assert not cache.register("Researcher backstory", BACKSTORIES["Researcher backstory"])
+    assert cache.register_group(BACKSTORIES)
+    assert cache.summary()["registered_blocks"] == 2
+
+
+def test_provider_content_replaces_registered_blocks():
+    endpoint = FakeEndpoint()
+    cache = ContextCache(backend=endpoint)
+    cache.register("resume", RESUME)
+    cache.register_group(BACKSTORIES)
+
+    prompt = BACKSTORIES["Profiler backstory"] + "\n" + RESUME
+    rewritten, provider_name = cache.rewrite([prompt], "models/gemini-2.0-flash")
+    assert provider_name == "cachedContents/1"
+    assert RESUME not in rewritten[0]
+    assert BACKSTORIES["Profiler backstory"] not in rewritten[0]
+
+    # Unchanged blocks reuse the same provider entry
+    cache.rewrite([prompt], "gemini-2.0-flash")
+    assert len(endpoint.created) == 1
+
+
+def test_provider_create_does_not_block_other_prompts():
+    gate = threading.Event()
+    endpoint = FakeEndpoint(gate)
+    cache = ContextCache(backend=endpoint)
+    cache.register("resume", RESUME)
+
+    slow = threading.Thread(target=cache.rewrite, args=([RESUME],))
+    slow.start()
+    assert endpoint.entered.wait(timeout=5), "provider create was never called"
+
+    # While the first call waits on the endpoint, others fall back to local dedup
+    done = []
+    other = threading.Thread(target=lambda: done.append(cache.rewrite([RESUME + RESUME])))
+    other.start()
+    other.join(timeout=2)
+    assert done, "rewrite blocked behind the provider create call"
+    rewritten, provider_name = done[0]
+    assert provider_name is None
+    assert rewritten[0].count(RESUME) == 1
+
+    gate.set()
+    slow.join(timeout=2)
+    assert cache.provider_content_name() == "cachedContents/1"
+
+
+def test_registration_during_create_marks_provider_entry_stale():
+    gate = threading.Event()
+    endpoint = FakeEndpoint(gate)
+    cache = ContextCache(backend=endpoint)
+    cache.register("resume", RESUME)
+
+    slow = threading.Thread(target=cache.provider_content_name)
+    slow.start()
+    assert endpoint.entered.wait(timeout=5), "provider create was never called"
+    cache.register("job analysis", "Requires Kubernetes and Terraform experience. " * 20)
+    gate.set()
+    slow.join(timeout=2)
+
+    # The entry created for the old blocks is deleted and replaced by one covering both
+    assert endpoint.deleted == ["cachedContents/1"]
+    assert cache.provider_content_name() == "cachedContents/2"
+    assert "job analysis" in endpoint.created[-1]
+
+
+def test_superseded_provider_entry_is_deleted():
+    endpoint = FakeEndpoint()
+    cache = ContextCache(backend=endpoint)
+    cache.register("resume", RESUME)
+    assert cache.provider_content_name() == "cachedContents/1"
+
+    cache.register("job analysis", "Requires Kubernetes and Terraform experience. " * 20)
+    assert cache.provider_content_name() == "cachedContents/2"
+    assert endpoint.deleted == ["cachedContents/1"]
\ No newline at end of file
@@ -0,0 +1,103 @@
+from deadlines import Deadline, LatencyHistory, TaskBudgeter, TaskTimer, allocate_budgets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeLLM:
+    """Stands in for the chat model; each call takes `latency` seconds of fake time"""
+
+    def __init__(self, clock, latency):
+        self.clock = clock
+        self.latency = latency
+        self.request_timeout = None
+
+    def invoke(self, prompt):
+        self.clock.now += self.latency
+        return "ok"
+
+
+class FakeAgent:
+    def __init__(self, llm):
+        self.llm = llm
+        self.max_execution_time = None
+
+
+def apply_limits(agent, seconds):
+    agent.max_execution_time = seconds
+    agent.llm.request_timeout = min(60, seconds)
+
+
+def _history():
+    history = LatencyHistory()
+    for name in ("a", "b", "c"):
+        history.observe(name, 100)
+    return history
+
+
+def test_tight_deadline_budgets_never_exceed_time_left():
+    deadline = Deadline(40, clock=FakeClock())
+    budgets = allocate_budgets(deadline, ["a", "b", "c", "d"], _history())
+    assert sum(budgets.values()) <= deadline.remaining()
+    assert all(seconds >= 1 for seconds in budgets.values())
+
+
+def test_slow_task_shrinks_budgets_of_later_tasks():
+    clock = FakeClock()
+    deadline = Deadline(300, clock=clock)
+    agents = {
+        "a": FakeAgent(FakeLLM(clock, latency=200)),
+        "b": FakeAgent(FakeLLM(clock, latency=10)),
+        "c": FakeAgent(FakeLLM(clock, latency=10)),
+    }
+    budgeter = TaskBudgeter(deadline, apply_limits, _history())
+    budgeter.plan(agents.items())
+    budgeter.start()
+    initial_c = agents["c"].max_execution_time
+    assert initial_c == 90
+
+    # Task "a" runs far over its expected time
+    agents["a"].llm.invoke("research")
+    budgeter.callback_for("a")(None)
+
+    assert "a" not in budgeter.budgets
+    assert agents["c"].max_execution_time < initial_c
+    assert agents["b"].max_execution_time + agents["c"].max_execution_time <= deadline.remaining()
+    assert agents["b"].llm.request_timeout == min(60, agents["b"].max_execution_time)
+
+
+def test_retry_rebudgets_every_planned_task_from_time_left():
+    clock = FakeClock()
+    deadline = Deadline(300, clock=clock)
+    agents = {name: FakeAgent(FakeLLM(clock, latency=50)) for name in ("a", "b")}
+    budgeter = TaskBudgeter(deadline, apply_limits, _history())
+    budgeter.plan(agents.items())
+    budgeter.start()
+    agents["a"].llm.invoke("research")
+    budgeter.callback_for("a")(None)
+
+    # The attempt failed (e.g. model overloaded); the retry reruns both tasks
+    clock.now += 100
+    budgets = budgeter.start()
+    assert set(budgets) == {"a", "b"}
+    assert sum(budgets.values()) <= deadline.remaining()
+
+
+def test_restarting_timer_excludes_failed_attempt_from_latency():
+    clock = FakeClock()
+    history = LatencyHistory()
+    timer = TaskTimer(history, clock=clock)
+
+    timer.start()
+    clock.now += 90  # overloaded attempt fails, then the backoff sleep
+    timer.start()  # retry
+    clock.now += 20
+    timer.callback_for("a")(None)
+
+    assert timer.durations == {"a": 20}
+    assert history.expected("a") == 20
@@ -0,0 +1,85 @@
+import pytest
+
+pytest.importorskip("pydantic")
+
+from incremental import TaskRunCache
+from schemas import JobRequirement, JobRequirements, describe_changes, diff_structured
+
+
+class FakeOutput:
+    def __init__(self, model):
+        self.pydantic = model
+        self.raw_output = model.model_dump_json()
+
+
+class FakeTextOutput:
+    def __init__(self, text):
+        self.raw_output = text
+
+
+class FakeTask:
+    def __init__(self, description="", context=None):
+        self.description = description
+        self.context = context
+        self.output = None
+
+
+def _requirements(*names, title="Backend Engineer"):
+    return JobRequirements(
+        job_title=title,
+        requirements=[JobRequirement(name=name) for name in names],
+    )
+
+
+def test_diff_structured_reports_list_and_scalar_changes():
+    changes = diff_structured(_requirements("Python", "SQL"), _requirements("Python", "Go", title="Platform Engineer"))
+    assert [item["name"] for item in changes["requirements"]["added"]] == ["Go"]
+    assert [item["name"] for item in changes["requirements"]["removed"]] == ["SQL"]
+    assert changes["job_title"] == {"old": "Backend Engineer", "new": "Platform Engineer"}
+    assert "requirements: added Go; removed SQL" in describe_changes(changes)
+
+
+def test_commit_records_changes_between_runs():
+    cache = TaskRunCache()
+    task = FakeTask()
+    named_tasks = {"research_task": task}
+    task_inputs = {"research_task": ("job_posting_url",)}
+
+    cache.plan(named_tasks, task_inputs, {"job_posting_url": "https://example.com/1"})
+    task.output = FakeOutput(_requirements("Python", "SQL"))
+    cache.commit()
+    assert cache.changes == {}
+
+    cache.plan(named_tasks, task_inputs, {"job_posting_url": "https://example.com/2"})
+    task.output = FakeOutput(_requirements("Python", "Kubernetes"))
+    cache.commit()
+    added = cache.changes["research_task"]["requirements"]["added"]
+    assert [item["name"] for item in added] == ["Kubernetes"]
+
+
+def test_editing_writeup_reuses_research_and_inlines_its_output():
+    research = FakeTask("Research the posting")
+    profile = FakeTask("Profile the candidate")
+    strategy = FakeTask("Tailor the resume", context=[research, profile])
+    named_tasks = {"research_task": research, "profile_task": profile, "resume_strategy_task": strategy}
+    task_inputs = {
+        "research_task": ("job_posting_url",),
+        "profile_task": ("github_url", "personal_writeup"),
+        "resume_strategy_task": ("resume",),
+    }
+    inputs = {"job_posting_url": "https://example.com/job", "github_url": "gh", "personal_writeup": "v1", "resume": "r"}
+
+    cache = TaskRunCache()
+    assert cache.plan(named_tasks, task_inputs, inputs) == list(named_tasks)
+    for name, task in named_tasks.items():
+        task.output = FakeTextOutput(f"{name} output")
+    cache.commit()
+
+    run_names = cache.plan(named_tasks, task_inputs, dict(inputs, personal_writeup="v2"))
+    assert run_names == ["profile_task", "resume_strategy_task"]
+
+    run_tasks = cache.prepare(named_tasks, run_names)
+    assert run_tasks == [profile, strategy]
+    assert strategy.context == [profile]
+    assert "research_task output" in strategy.description
+    assert "research_task output" not in profile.description
@@ -0,0 +1,61 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from prescreen import SKILL_NAMES, rank_postings, score_match, skill_vector
+
+
+def skills_in(text):
+    vector = skill_vector(text)
+    return {SKILL_NAMES[i] for i in np.flatnonzero(vector)}
+
+
+def test_slash_joined_skills_are_split():
+    resume = "Python/Django developer building HTML/CSS front ends"
+    posting = "We need Python, Django, HTML and CSS experience."
+    match = score_match(resume, posting)
+    assert set(match.matched_skills) == {"Python", "Django", "HTML/CSS"}
+    assert match.missing_skills == []
+
+
+def test_slash_joined_aliases_still_match_whole():
+    assert {"CI/CD", "SQL"} <= skills_in("Maintained CI/CD pipelines and PL/SQL procedures")
+
+
+def test_java_slash_spring_counts_both():
+    assert {"Java", "Spring"} <= skills_in("Strong Java/Spring background")
+
+
+def test_leading_dot_alias():
+    assert "C#" in skills_in("Five years of .NET development")
+
+
+def test_everyday_words_are_not_skills():
+    text = (
+        "Enjoy the rest of your day in spring. Our shell company ships containers, "
+        "the lambda of our architecture is communication."
+    )
+    assert skills_in(text) == set()
+
+
+def test_spring_boot_with_java_counts_spring_once():
+    vector = skill_vector("Java and Spring Boot")
+    assert vector[SKILL_NAMES.index("Spring")] == 1
+    assert vector[SKILL_NAMES.index("Java")] == 1
+
+
+def test_prose_uses_of_short_tech_names_are_not_skills():
+    text = "We value swift delivery, testing ideas early and job security. Each node of the graph matters."
+    assert skills_in(text) == set()
+    assert {"Node.js", "Swift", "Testing", "Security"} <= skills_in(
+        "Node.js services, SwiftUI apps, unit testing and application security reviews"
+    )
+
+
+def test_rank_postings_orders_best_first():
+    resume = "Python, Docker, Kubernetes, AWS"
+    ranked = rank_postings(resume, {
+        "java": "Java and Spring Boot developer",
+        "python": "Python engineer with Docker and Kubernetes on AWS",
+    }, top_n=1)
+    assert [url for url, _ in ranked] == ["python"]
\ No newline at end of file
@@ -0,0 +1,72 @@
+from resume import parse_resume
+from toolcache import LRUCache
+
+
+def test_all_caps_skill_lists_are_not_headings():
+    resume = parse_resume(
+        "SKILLS\n"
+        "PYTHON, AWS, GCP, K8S\n"
+        "Docker | Terraform\n"
+        "EDUCATION\n"
+        "BSc Computer Science\n"
+    )
+    assert [section.id for section in resume.sections] == ["skills", "education"]
+    assert [skill.name for skill in resume.skills] == ["PYTHON", "AWS", "GCP", "K8S", "Docker", "Terraform"]
+
+
+def test_all_caps_heading_outside_skill_section():
+    resume = parse_resume("Jane Doe\nOPEN SOURCE WORK\n- Maintainer of a parser\n")
+    assert [section.heading for section in resume.sections] == ["Header", "Open Source Work"]
+
+
+def test_wrapped_bullet_is_joined_not_a_new_role():
+    resume = parse_resume(
+        "EXPERIENCE\n"
+        "Senior Engineer, Acme (2020-2024)\n"
+        "- Built a Kafka-based event pipeline for the payments platform that\n"
+        "handles 1M messages per second\n"
+        "- Led migration to Kubernetes\n"
+        "Engineer, Foo\n"
+        "- Built internal tools\n"
+    )
+    roles = resume.get_section("experience").roles
+    assert [role.title for role in roles] == ["Senior Engineer, Acme (2020-2024)", "Engineer, Foo"]
+    assert [bullet.text for bullet in roles[0].bullets] == [
+        "Built a Kafka-based event pipeline for the payments platform that handles 1M messages per second",
+        "Led migration to Kubernetes",
+    ]
+
+
+def test_role_title_after_long_unterminated_bullet_starts_a_new_role():
+    resume = parse_resume(
+        "EXPERIENCE\n"
+        "Senior Engineer, Acme (2020-2024)\n"
+        "- Designed and operated the Kafka event pipeline for the payments platform\n"
+        "Software Engineer, Foo Corp (2017-2020)\n"
+        "- Built internal tools\n"
+    )
+    roles = resume.get_section("experience").roles
+    assert [role.title for role in roles] == [
+        "Senior Engineer, Acme (2020-2024)",
+        "Software Engineer, Foo Corp (2017-2020)",
+    ]
+    assert [bullet.text for bullet in roles[0].bullets] == [
+        "Designed and operated the Kafka event pipeline for the payments platform",
+    ]
+    assert [bullet.text for bullet in roles[1].bullets] == ["Built internal tools"]
+
+
+def test_raw_tokens_use_original_text_length():
+    text = "SUMMARY\n" + "Backend engineer.   " * 20
+    resume = parse_resume(text)
+    assert resume.raw_tokens() == (len(text) + 3) // 4
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
\ No newline at end of file
@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+
+from toolcache import LRUCache, ToolCallCache
+
+CALLERS = 8
+
+
+def _wait_for_callers(cache, tool_name, count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while cache.summary().get(tool_name, {}).get("calls", 0) < count:
+        assert time.monotonic() < deadline, "callers never reached the cache"
+        time.sleep(0.01)
+
+
+def _call_concurrently(cache, func):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(cache.call("search", "key", func))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_identical_calls_execute_once():
+    cache = ToolCallCache()
+    release = threading.Event()
+    executions = []
+
+    def slow_search():
+        executions.append(1)
+        release.wait(timeout=5)
+        return "result"
+
+    threads, results, errors = _call_concurrently(cache, slow_search)
+    _wait_for_callers(cache, "search", CALLERS)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert errors == []
+    assert results == ["result"] * CALLERS
+    assert len(executions) == 1
+    assert cache.summary()["search"] == {"calls": CALLERS, "executions": 1, "deduped": CALLERS - 1}
+
+
+def test_waiters_get_the_leaders_error_and_failures_are_not_cached():
+    cache = ToolCallCache()
+    release = threading.Event()
+
+    def failing_search():
+        release.wait(timeout=5)
+        raise RuntimeError("search backend down")
+
+    threads, results, errors = _call_concurrently(cache, failing_search)
+    _wait_for_callers(cache, "search", CALLERS)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == []
+    assert len(errors) == CALLERS
+    assert all(str(error) == "search backend down" for error in errors)
+    assert cache.summary()["search"]["executions"] == 1
+
+    # The failure wasn't stored, so the next call runs the tool again
+    assert cache.call("search", "key", lambda: "recovered") == "recovered"
+    assert cache.summary()["search"]["executions"] == 2
+    with pytest.raises(RuntimeError):
+        cache.call("search", "other", failing_search)
+
+
+def test_lru_discard_only_removes_the_same_value():
+    cache = LRUCache(4)
+    first, second = object(), object()
+    cache.put("key", first)
+    cache.put("key", second)
+    cache.discard("key", first)
+    assert cache.get("key") is second
+    cache.discard("key", second)
+    assert cache.get("key") is None
@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("crewai_tools")
+
+import tools
+
+
+def _resume_files(tmp_path):
+    first = tmp_path / "first.md"
+    second = tmp_path / "second.md"
+    first.write_text("# Resume\nPython, Go\n")
+    second.write_text("# Resume\nPython, Go\n")
+    return str(first), str(second)
+
+
+def test_releasing_one_session_keeps_another_sessions_index(tmp_path, monkeypatch):
+    builds = []
+    monkeypatch.setattr(tools, "_build_search_tool", lambda path: builds.append(path) or object())
+    first, second = _resume_files(tmp_path)
+
+    tools.warm_search_index(first).result()
+    second_index = tools.warm_search_index(second).result()
+    # Each file has its own build, so deleting one can't break the other
+    assert builds == [first, second]
+
+    tools.release_resume_file(first)
+    assert tools.warm_search_index(second).result() is second_index
+    assert len(builds) == 2
+
+
+def test_failed_index_build_is_retried(tmp_path, monkeypatch):
+    attempts = []
+
+    def flaky_build(path):
+        attempts.append(path)
+        if len(attempts) == 1:
+            raise RuntimeError("embedding service unavailable")
+        return "index"
+
+    monkeypatch.setattr(tools, "_build_search_tool", flaky_build)
+    first, _ = _resume_files(tmp_path)
+
+    with pytest.raises(RuntimeError):
+        tools.warm_search_index(first).result()
+    assert tools.warm_search_index(first).result() == "index"
+    assert len(attempts) == 2
\ No newline at end of file
@@ -0,0 +1,37 @@
+import io
+import os
+
+import pytest
+
+from uploads import SPOOL_PREFIX, check_upload_size, spool_upload, track_rss
+
+
+def test_check_upload_size_rejects_large_files():
+    check_upload_size(1024, limit=2048)
+    with pytest.raises(ValueError):
+        check_upload_size(4096, limit=2048)
+
+
+def test_spool_rss_stays_well_below_upload_size():
+    upload = io.BytesIO(b"x" * (16 * 1024 * 1024))
+
+    with track_rss() as usage:
+        path, _, size = spool_upload(upload, ".txt", chunk_size=64 * 1024, on_chunk=usage.sample)
+    try:
+        assert size == 16 * 1024 * 1024
+        if usage.peak_delta_mb is None:
+            pytest.skip("RSS is not available on this platform")
+        # Chunks are buffer slices, so the upload is never copied whole
+        assert usage.peak_delta_mb < 8
+    finally:
+        os.unlink(path)
+
+
+def test_spooled_uploads_are_not_swept_as_stray_tmp_files():
+    path, _, _ = spool_upload(io.BytesIO(b"resume"), ".txt")
+    try:
+        name = os.path.basename(path)
+        assert name.startswith(SPOOL_PREFIX)
+        assert not name.startswith("tmp")
+    finally:
+        os.unlink(path)
@@ -0,0 +1,125 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+def call_key(tool_name, args, kwargs):
+    """Build a stable cache key for a tool call"""
+    payload = json.dumps([args, kwargs], sort_keys=True, default=str)
+    return f"{tool_name}:{payload}"
+
+
+class LRUCache:
+    """Small thread-safe mapping that evicts the least recently used entries"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def setdefault(self, key, factory):
+        """Return the entry for key, creating it with factory() under the lock"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            value = self._entries[key] = factory()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def discard(self, key, value):
+        """Remove key only if it still maps to this exact value"""
+        with self._lock:
+            if self._entries.get(key) is value:
+                del self._entries[key]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class _InFlightCall:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ToolCallCache:
+    """Per-run memoisation of tool calls with single-flight semantics.
+
+    The first caller for a given key executes the tool; identical calls made
+    while it is running wait for that result instead of executing again, and
+    later identical calls reuse the stored result. Failed calls are not cached.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self._in_flight = {}
+        self.stats = {}
+
+    def call(self, tool_name, key, func):
+        with self._lock:
+            stats = self.stats.setdefault(tool_name, {"calls": 0, "executions": 0, "deduped": 0})
+            stats["calls"] += 1
+            if key in self._results:
+                stats["deduped"] += 1
+                return self._results[key]
+            in_flight = self._in_flight.get(key)
+            is_leader = in_flight is None
+            if is_leader:
+                in_flight = self._in_flight[key] = _InFlightCall()
+                stats["executions"] += 1
+            else:
+                stats["deduped"] += 1
+
+        if not is_leader:
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return in_flight.result
+
+        try:
+            in_flight.result = func()
+        except Exception as e:
+            in_flight.error = e
+            raise
+        else:
+            with self._lock:
+                self._results[key] = in_flight.result
+            return in_flight.result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.event.set()
+
+    def summary(self):
+        """Per-tool call counts, including how many calls were saved"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self.stats.items()}
+
+    def total_saved(self):
+        with self._lock:
+            return sum(stats["deduped"] for stats in self.stats.values())
\ No newline at end of file
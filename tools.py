@@ -3,23 +3,34 @@ from crewai_tools import (
     ScrapeWebsiteTool,
     MDXSearchTool,
     SerperDevTool,
-    PDFSearchTool
+    PDFSearchTool,
+    BaseTool,
+    tool
 )
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from resume import parse_resume, ResumeTokenMeter
+from toolcache import call_key, LRUCache
 import PyPDF2
+import hashlib
+import mmap
 import os
 import tempfile
 
 search_tool = SerperDevTool()
 scrape_tool = ScrapeWebsiteTool()
 
+def open_mapped(path):
+    """Memory-map a file read-only so parsers read it without buffering a copy"""
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
 def extract_text_from_pdf(pdf_path):
     """Extract text from PDF file using PyPDF2"""
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
+        with open_mapped(pdf_path) as mapped:
+            pdf_reader = PyPDF2.PdfReader(mapped)
+            text = "\n".join(page.extract_text() for page in pdf_reader.pages) + "\n"
         return text
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
@@ -41,6 +52,166 @@ def convert_pdf_to_text_file(pdf_path):
         print(f"Error converting PDF to text: {e}")
         return None
 
+class RunScopedTool(BaseTool):
+    """Wraps a tool so identical calls within a run share one execution
+    and calls stop once the run deadline has passed"""
+    inner: Any
+    tool_cache: Any = None
+    deadline: Any = None
+
+    def _generate_description(self):
+        # Keep the wrapped tool's already formatted description
+        pass
+
+    def _run(self, *args, **kwargs):
+        if self.deadline is not None and self.deadline.expired():
+            # Let the agent wrap up with what it already has
+            return "Time budget for this run is exhausted. Give your best final answer now."
+        if self.tool_cache is None:
+            return self.inner.run(*args, **kwargs)
+        key = call_key(self.inner.name, args, kwargs)
+        return self.tool_cache.call(self.inner.name, key, lambda: self.inner.run(*args, **kwargs))
+
+def run_scoped_tool(inner_tool, tool_cache=None, deadline=None):
+    """Return inner_tool wrapped with the per-run cache and deadline, if any"""
+    if tool_cache is None and deadline is None:
+        return inner_tool
+    return RunScopedTool(
+        name=inner_tool.name,
+        description=inner_tool.description,
+        args_schema=inner_tool.args_schema,
+        inner=inner_tool,
+        tool_cache=tool_cache,
+        deadline=deadline
+    )
+
+# Parsed resumes keyed by content so every agent and re-upload shares one parse
+MAX_PARSED_RESUMES = 32
+_parsed_resumes = LRUCache(MAX_PARSED_RESUMES)
+
+# Semantic search indexes are embedded in the background. An index is built from
+# its file, so each spooled file gets its own entry (content hash plus path) that
+# its session can release without breaking other sessions' builds
+MAX_SEARCH_INDEXES = 8
+_index_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="resume-index")
+_index_futures = LRUCache(MAX_SEARCH_INDEXES)
+
+def _content_key(path):
+    """Cache key for a resume file based on its extension and content hash"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(65536), b""):
+            digest.update(chunk)
+    return (os.path.splitext(path)[1].lower(), digest.hexdigest())
+
+def read_resume_text(resume_path):
+    """Read raw resume text from a PDF, Markdown or text file"""
+    file_extension = os.path.splitext(resume_path)[1].lower()
+    if file_extension == '.pdf':
+        return extract_text_from_pdf(resume_path)
+    if os.path.getsize(resume_path) == 0:
+        return ""
+    # Decode straight from the mapped pages rather than an intermediate bytes copy
+    with open_mapped(resume_path) as mapped:
+        return str(memoryview(mapped), 'utf-8', 'replace').replace('\r\n', '\n')
+
+def load_structured_resume(resume_path):
+    """Parse the resume once and return the shared structured Resume"""
+    key = _content_key(resume_path)
+    resume = _parsed_resumes.get(key)
+    if resume is None:
+        text = read_resume_text(resume_path)
+        if not text or not text.strip():
+            return None
+        resume = parse_resume(text)
+        _parsed_resumes.put(key, resume)
+    return resume
+
+def create_resume_section_tool(resume, token_meter=None):
+    """Create a tool that serves the resume outline or one section by ID"""
+    if token_meter is None:
+        token_meter = ResumeTokenMeter()
+    # Baseline is the raw text agents used to read in full with FileReadTool
+    full_resume_tokens = resume.raw_tokens()
+
+    @tool("Read resume section")
+    def read_resume_section(section_id: str = "") -> str:
+        """Read the candidate's resume. Call with an empty section_id to get
+        the outline of section IDs and skills, then request a single section
+        (e.g. 'experience', 'skills') by its ID. Use 'all' for the full resume."""
+        section_id = (section_id or "").strip()
+        if not section_id:
+            text = resume.outline()
+        elif section_id.lower() == "all":
+            text = resume.to_text()
+        else:
+            text = resume.section_text(section_id)
+            if text is None:
+                text = f"Unknown section '{section_id}'.\n" + resume.outline()
+        token_meter.record(text, full_resume_tokens)
+        return text
+
+    return read_resume_section
+
+def _build_search_tool(resume_path):
+    if resume_path.lower().endswith('.pdf'):
+        return PDFSearchTool(pdf=resume_path)
+    return MDXSearchTool(mdx=resume_path)
+
+def warm_search_index(resume_path):
+    """Start embedding the resume for semantic search in a background worker.
+    
+    Safe to call repeatedly; returns the future for the file's build. Failed
+    builds are forgotten, so the next call starts a fresh one.
+    """
+    key = _index_key(resume_path)
+    submitted = []
+
+    def submit():
+        future = _index_executor.submit(_build_search_tool, resume_path)
+        submitted.append(future)
+        return future
+
+    future = _index_futures.setdefault(key, submit)
+    if submitted:
+        # Added outside the cache lock: it runs at once if the build already finished
+        future.add_done_callback(lambda done: _forget_failed_index(key, done))
+    return future
+
+def _index_key(resume_path):
+    return _content_key(resume_path) + (os.path.abspath(resume_path),)
+
+def _forget_failed_index(key, future):
+    if future.cancelled() or future.exception() is not None:
+        _index_futures.discard(key, future)
+
+def release_resume_file(resume_path):
+    """Drop the search index built from a resume file that is about to be deleted.
+
+    The parsed resume is shared by content across sessions and holds no
+    reference to the file, so it is left to the LRU cache.
+    """
+    if not os.path.exists(resume_path):
+        return
+    _index_futures.pop(_index_key(resume_path))
+
+class LazySearchTool(BaseTool):
+    """Semantic resume search that only waits for the index on first use"""
+    name: str = "Search the resume semantically"
+    description: str = (
+        "Semantic search over the candidate's resume. Pass a search_query "
+        "describing what to look for, e.g. 'cloud infrastructure experience'."
+    )
+    resume_path: str
+
+    def _run(self, search_query: str) -> str:
+        try:
+            search_tool = warm_search_index(self.resume_path).result()
+        except Exception as e:
+            print(f"Error building resume search index: {e}")
+            return f"Semantic search is unavailable ({e}). Use the resume reading tool instead."
+        return search_tool.run(search_query=search_query)
+
 def get_resume_tools(resume_path):
     """Initialize and return resume tools with the provided resume path"""
     file_extension = os.path.splitext(resume_path)[1].lower()
@@ -71,25 +242,21 @@ def get_resume_tools(resume_path):
     else:
         raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: .pdf, .md, .txt")
 
-def get_resume_tools_advanced(resume_path):
+def get_resume_tools_advanced(resume_path, token_meter=None):
     """Enhanced version using only PyPDF2 for PDF processing"""
     file_extension = os.path.splitext(resume_path)[1].lower()
     
     if file_extension == '.pdf':
         try:
-            # Try CrewAI's PDFSearchTool first
-            pdf_search_tool = PDFSearchTool(pdf=resume_path)
+            # PDF search index is built in the background and awaited on first query
+            warm_search_index(resume_path)
+            pdf_search_tool = LazySearchTool(resume_path=resume_path)
             
-            # Extract text using PyPDF2
-            text = extract_text_from_pdf(resume_path)
+            # Parse the resume once and serve it section by section
+            resume = load_structured_resume(resume_path)
             
-            if text and text.strip():
-                # Create temporary text file
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
-                    tmp_file.write(text)
-                    text_file_path = tmp_file.name
-                
-                read_resume = FileReadTool(file_path=text_file_path)
+            if resume is not None:
+                read_resume = create_resume_section_tool(resume, token_meter)
                 return read_resume, pdf_search_tool
             else:
                 # If text extraction fails, use PDF search tool for both
@@ -110,11 +277,17 @@ def get_resume_tools_advanced(resume_path):
                 raise Exception("Failed to extract text from PDF using PyPDF2")
     
     elif file_extension in ['.md', '.txt']:
-        read_resume = FileReadTool(file_path=resume_path)
+        resume = load_structured_resume(resume_path)
+        if resume is not None:
+            read_resume = create_resume_section_tool(resume, token_meter)
+        else:
+            read_resume = FileReadTool(file_path=resume_path)
         if file_extension == '.md':
-            semantic_search_resume = MDXSearchTool(mdx=resume_path)
+            warm_search_index(resume_path)
+            semantic_search_resume = LazySearchTool(resume_path=resume_path)
         else:
-            semantic_search_resume = FileReadTool(file_path=resume_path)
+            # The section tool already covers targeted lookups for plain text
+            semantic_search_resume = read_resume
         return read_resume, semantic_search_resume
     
     else:
@@ -0,0 +1,124 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+
+try:
+    import psutil
+except ImportError:  # Optional; fall back to /proc on Linux
+    psutil = None
+
+# Bytes written to disk per step while spooling an upload
+CHUNK_SIZE = 1024 * 1024
+
+# Spooled uploads get their own prefix so sweeps of stray tmp*.txt files skip them
+SPOOL_PREFIX = "resume_upload_"
+
+# Largest resume file accepted in a single upload (override with MAX_UPLOAD_MB)
+DEFAULT_MAX_UPLOAD_MB = 20
+
+
+def max_upload_bytes():
+    """Largest accepted upload in bytes"""
+    limit_mb = float(os.getenv("MAX_UPLOAD_MB", DEFAULT_MAX_UPLOAD_MB))
+    return int(limit_mb * 1024 * 1024)
+
+
+def check_upload_size(size, limit=None):
+    """Raise ValueError if a single uploaded file is larger than the limit"""
+    limit = max_upload_bytes() if limit is None else limit
+    if size > limit:
+        raise ValueError(
+            f"File is {size / 1024 / 1024:.1f} MB, which exceeds the "
+            f"{limit / 1024 / 1024:.0f} MB upload limit"
+        )
+
+
+def current_rss_bytes():
+    """Resident set size of this process right now, or None if unavailable"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class RssUsage:
+    """Process RSS sampled around and during one upload"""
+
+    def __init__(self):
+        self.start_bytes = current_rss_bytes()
+        self.peak_bytes = self.start_bytes
+
+    def sample(self):
+        rss = current_rss_bytes()
+        if rss is not None and self.peak_bytes is not None:
+            self.peak_bytes = max(self.peak_bytes, rss)
+
+    @property
+    def peak_delta_mb(self):
+        """How far RSS rose above its starting point, or None if RSS is unavailable"""
+        if self.start_bytes is None:
+            return None
+        return (self.peak_bytes - self.start_bytes) / 1024 / 1024
+
+
+@contextlib.contextmanager
+def track_rss():
+    """Sample process RSS before and after a block; call usage.sample() inside it.
+
+    RSS is process-wide, so memory allocated by other sessions' threads in
+    the same window is included; the figure is an upper bound for the block.
+    """
+    usage = RssUsage()
+    try:
+        yield usage
+    finally:
+        usage.sample()
+
+
+def _iter_chunks(fileobj, chunk_size):
+    # Prefer zero-copy memoryview slices over the upload's in-memory buffer
+    getbuffer = getattr(fileobj, "getbuffer", None)
+    if getbuffer is not None:
+        with getbuffer() as view:
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset:offset + chunk_size]
+        return
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        yield chunk
+
+
+def content_hash(fileobj, chunk_size=CHUNK_SIZE):
+    """SHA-256 of an upload, computed over buffer slices without copying it"""
+    digest = hashlib.sha256()
+    for chunk in _iter_chunks(fileobj, chunk_size):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def spool_upload(fileobj, suffix, chunk_size=CHUNK_SIZE, on_chunk=None):
+    """Stream an uploaded file to a temp file, hashing it on the way.
+
+    Returns (path, sha256_hex, size). Memory use is bounded by chunk_size
+    because chunks are memoryview slices of the upload buffer. on_chunk is
+    called after each chunk is written, e.g. to sample memory use.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with tempfile.NamedTemporaryFile(mode="wb", prefix=SPOOL_PREFIX, suffix=suffix, delete=False) as tmp_file:
+        try:
+            for chunk in _iter_chunks(fileobj, chunk_size):
+                digest.update(chunk)
+                tmp_file.write(chunk)
+                size += len(chunk)
+                if on_chunk is not None:
+                    on_chunk()
+        except Exception:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    return tmp_file.name, digest.hexdigest(), size
\ No newline at end of file